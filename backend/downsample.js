@@ -0,0 +1,183 @@
+// Streaming downsamplers for chart queries.
+// Both split the [start, end] time range into equal buckets and consume rows in
+// ascending time order one at a time. MinMax holds two rows per bucket; LTTB holds
+// its output plus the convex hull of the two buckets it is comparing (see LttbBucket).
+
+const timeOf = (row) => new Date(row.timestamp).getTime();
+const valueOf = (row) => Number(row.value);
+
+const cross = (o, a, b) => (a.t - o.t) * (b.v - o.v) - (a.v - o.v) * (b.t - o.t);
+
+// Running sums plus the convex hull of a bucket's (t, v) points. For a fixed
+// anchor and next-bucket average the LTTB triangle area is |linear in (t, v)|,
+// so its maximum always lies on a hull vertex and every other row can be dropped.
+class LttbBucket {
+  constructor(index) {
+    this.index = index;
+    this.n = 0;
+    this.sumT = 0;
+    this.sumV = 0;
+    this.lower = [];
+    this.upper = [];
+  }
+
+  add(point) {
+    this.n += 1;
+    this.sumT += point.t;
+    this.sumV += point.v;
+    // Andrew's monotone chain; rows arrive sorted by time. For equal times the
+    // lower hull keeps only the lowest value and the upper hull the highest.
+    const { lower, upper } = this;
+    let last = lower[lower.length - 1];
+    if (!(last && last.t === point.t && last.v <= point.v)) {
+      if (last && last.t === point.t) lower.pop();
+      while (lower.length >= 2 && cross(lower[lower.length - 2], lower[lower.length - 1], point) <= 0) {
+        lower.pop();
+      }
+      lower.push(point);
+    }
+    last = upper[upper.length - 1];
+    if (!(last && last.t === point.t && last.v >= point.v)) {
+      if (last && last.t === point.t) upper.pop();
+      while (upper.length >= 2 && cross(upper[upper.length - 2], upper[upper.length - 1], point) >= 0) {
+        upper.pop();
+      }
+      upper.push(point);
+    }
+  }
+
+  average() {
+    return { t: this.sumT / this.n, v: this.sumV / this.n };
+  }
+
+  // Hull vertices in arrival order, so ties resolve to the earliest row
+  candidates() {
+    const unique = new Map();
+    for (const point of [...this.lower, ...this.upper]) unique.set(point.seq, point);
+    return [...unique.values()].sort((a, b) => a.seq - b.seq);
+  }
+}
+
+// Largest-Triangle-Three-Buckets (Steinarsson 2013) over time buckets.
+// Keeps the first and last rows and, per bucket, the row forming the largest
+// triangle with the previously kept row and the average of the next bucket.
+class LttbDownsampler {
+  constructor(start, end, points) {
+    this.start = new Date(start).getTime();
+    this.span = Math.max(1, new Date(end).getTime() - this.start);
+    this.buckets = Math.max(1, points - 2);
+    this.selected = [];
+    this.open = []; // at most two buckets: the one being decided and the next
+    this.anchor = null; // hull point of the last kept row
+    this.pending = null;
+    this.seq = 0;
+  }
+
+  bucketOf(t) {
+    const b = Math.floor(((t - this.start) / this.span) * this.buckets);
+    return Math.min(this.buckets - 1, Math.max(0, b));
+  }
+
+  // Times relative to start keep the hull cross products well conditioned
+  pointOf(row) {
+    return { t: timeOf(row) - this.start, v: valueOf(row), seq: this.seq++, row };
+  }
+
+  push(row) {
+    if (this.anchor === null) {
+      this.anchor = this.pointOf(row);
+      this.selected.push(row);
+      return;
+    }
+    // The newest row is held back so the very last row is always kept as is
+    if (this.pending !== null) {
+      this.add(this.pending);
+    }
+    this.pending = row;
+  }
+
+  add(row) {
+    const point = this.pointOf(row);
+    const index = this.bucketOf(point.t + this.start);
+    const last = this.open[this.open.length - 1];
+    if (!last || last.index !== index) {
+      this.open.push(new LttbBucket(index));
+    }
+    this.open[this.open.length - 1].add(point);
+    if (this.open.length === 3) {
+      this.select(this.open[0], this.open[1].average());
+      this.open.shift();
+    }
+  }
+
+  select(bucket, next) {
+    const { t: at, v: av } = this.anchor;
+    let best = null;
+    let bestArea = -1;
+    for (const point of bucket.candidates()) {
+      const area = Math.abs((at - next.t) * (point.v - av) - (at - point.t) * (next.v - av));
+      if (area > bestArea) {
+        bestArea = area;
+        best = point;
+      }
+    }
+    this.selected.push(best.row);
+    this.anchor = best;
+  }
+
+  finish() {
+    while (this.open.length > 0) {
+      const next = this.open[1]
+        ? this.open[1].average()
+        : { t: timeOf(this.pending) - this.start, v: valueOf(this.pending) };
+      this.select(this.open[0], next);
+      this.open.shift();
+    }
+    if (this.pending !== null) {
+      this.selected.push(this.pending);
+    }
+    return this.selected;
+  }
+}
+
+// Min/max per bucket: every spike survives, at up to two rows per bucket.
+class MinMaxDownsampler {
+  constructor(start, end, points) {
+    this.start = new Date(start).getTime();
+    this.span = Math.max(1, new Date(end).getTime() - this.start);
+    this.buckets = Math.max(1, Math.floor(points / 2));
+    this.slots = new Map(); // bucket index -> { min, max }
+  }
+
+  push(row) {
+    const b = Math.min(this.buckets - 1, Math.max(0, Math.floor(((timeOf(row) - this.start) / this.span) * this.buckets)));
+    const slot = this.slots.get(b);
+    if (!slot) {
+      this.slots.set(b, { min: row, max: row });
+      return;
+    }
+    if (valueOf(row) < valueOf(slot.min)) slot.min = row;
+    if (valueOf(row) > valueOf(slot.max)) slot.max = row;
+  }
+
+  finish() {
+    const rows = [];
+    const indexes = [...this.slots.keys()].sort((a, b) => a - b);
+    for (const index of indexes) {
+      const { min, max } = this.slots.get(index);
+      if (min === max) {
+        rows.push(min);
+      } else {
+        rows.push(...(timeOf(min) <= timeOf(max) ? [min, max] : [max, min]));
+      }
+    }
+    return rows;
+  }
+}
+
+const DOWNSAMPLERS = {
+  lttb: LttbDownsampler,
+  minmax: MinMaxDownsampler,
+};
+
+module.exports = { LttbDownsampler, MinMaxDownsampler, DOWNSAMPLERS };
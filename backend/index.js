@@ -1,9 +1,11 @@
 require('dotenv').config();
 
+const crypto = require('crypto');
 const express = require('express');
 const cors = require('cors');
 const mqtt = require('mqtt');
 const { Pool } = require('pg');
+const { DOWNSAMPLERS } = require('./downsample');
 
 const app = express();
 const port = process.env.PORT || 3000;
@@ -28,8 +30,13 @@ const pool = new Pool({
   reconnectPeriod: 1000
 });*/
 
+// With MQTT_INGEST_GROUP set, the backend joins a shared subscription so it can
+// split the stream with the Python ingest consumers instead of duplicating it.
+const ingestGroup = process.env.MQTT_INGEST_GROUP;
+const ingestTopic = ingestGroup ? `$share/${ingestGroup}/campus/+/+` : 'campus/+/+';
+
 const mqttClient = mqtt.connect(process.env.MQTT_BROKER_URL, {
-  clientId: 'campus-iot-backend',
+  clientId: ingestGroup ? `campus-iot-backend-${Math.random().toString(16).slice(2, 10)}` : 'campus-iot-backend',
   clean: true,
   reconnectPeriod: 1000,
 });
@@ -37,9 +44,9 @@ const mqttClient = mqtt.connect(process.env.MQTT_BROKER_URL, {
 
 mqttClient.on('connect', () => {
   console.log('✅ Connected to Mosquitto');
-  mqttClient.subscribe('campus/+/+', { qos: 1 }, (err) => {
+  mqttClient.subscribe(ingestTopic, { qos: 1 }, (err) => {
     if (!err) {
-      console.log('📡 Subscribed to campus/+/+');
+      console.log(`📡 Subscribed to ${ingestTopic}`);
     }
   });
 });
@@ -52,9 +59,19 @@ mqttClient.on('message', async (topic, message) => {
 
     console.log(`📥 [${deviceId}] ${metric}: ${payload.value}`);
 
+    if (!ingestGroup) {
+      publishLive(deviceId, metric, payload);
+    }
+
+    // Unregistered devices are dropped here (negative lookups are cached too)
+    // instead of failing the insert on the foreign key
+    if (!(await getCachedDevice(deviceId))) {
+      return;
+    }
+
     // Store telemetry in the database
     const query = {
-      text: 'INSERT INTO telemetry(device_id, metric, value, unit, timestamp) VALUES($1, $2, $3, $4, $5)',
+      text: 'INSERT INTO telemetry(device_id, metric, value, unit, timestamp) VALUES($1, $2, $3, $4, $5) ON CONFLICT (device_id, metric, timestamp) DO NOTHING',
       values: [deviceId, metric, payload.value, payload.unit, payload.timestamp],
     };
     await pool.query(query);
@@ -68,8 +85,29 @@ mqttClient.on('error', (error) => {
   console.error('MQTT Client Error:', error);
 });
 
+// In a shared-subscription group this instance only sees part of the stream,
+// so live push gets its own plain subscription to the whole of campus/+/+.
+if (ingestGroup) {
+  const liveClient = mqtt.connect(process.env.MQTT_BROKER_URL, {
+    clientId: `campus-iot-live-${Math.random().toString(16).slice(2, 10)}`,
+    clean: true,
+    reconnectPeriod: 1000,
+  });
+  liveClient.on('connect', () => liveClient.subscribe('campus/+/+', { qos: 0 }));
+  liveClient.on('message', (topic, message) => {
+    try {
+      const [, deviceId, metric] = topic.split('/');
+      publishLive(deviceId, metric, JSON.parse(message.toString()));
+    } catch (error) {
+      console.error('Failed to process live MQTT message', error);
+    }
+  });
+}
+
 app.use(cors()); // Enable CORS for all routes
-app.use(express.json());
+const jsonBody = express.json();
+// Bulk provisioning parses its own, much larger body (see /api/devices/bulk)
+app.use((req, res, next) => (req.path === '/api/devices/bulk' ? next() : jsonBody(req, res, next)));
 
 app.get('/', (req, res) => {
   res.send('Campus IoT Backend is running!');
@@ -77,6 +115,81 @@ app.get('/', (req, res) => {
 
 // API Endpoints
 
+// Device registry cache
+// Device lookups are served from memory. Every write (here, in another backend
+// instance or from simulators/provision_devices.py) sends NOTIFY devices_changed,
+// which clears the cache on all instances; the TTL only covers a lost LISTEN connection.
+const DEVICE_CACHE_TTL_MS = parseInt(process.env.DEVICE_CACHE_TTL_MS, 10) || 60000;
+// Topics carry arbitrary device ids, so negative lookups are capped too (least recently used go first)
+const DEVICE_CACHE_MAX = parseInt(process.env.DEVICE_CACHE_MAX, 10) || 10000;
+const deviceCache = new Map(); // device_id -> { row, expires }, in least recently used order
+const deviceListCache = new Map(); // filter key -> { rows, etag, expires }
+// Bumped on every invalidation: a lookup that started before it must not store its result
+let deviceGeneration = 0;
+
+const invalidateDevices = () => {
+  deviceGeneration += 1;
+  deviceCache.clear();
+  deviceListCache.clear();
+};
+
+const notifyDevicesChanged = async () => {
+  invalidateDevices();
+  await pool.query('NOTIFY devices_changed');
+};
+
+const listenForDeviceChanges = async () => {
+  let client;
+  let retrying = false;
+  const retry = (error) => {
+    if (retrying) {
+      return;
+    }
+    retrying = true;
+    invalidateDevices();
+    if (client) {
+      // Passing the error destroys the connection instead of returning it to the pool
+      client.release(error);
+    }
+    setTimeout(listenForDeviceChanges, 5000);
+  };
+  try {
+    client = await pool.connect();
+    client.on('notification', invalidateDevices);
+    client.on('error', (error) => {
+      console.error('Device registry LISTEN connection lost', error);
+      retry(error);
+    });
+    await client.query('LISTEN devices_changed');
+  } catch (error) {
+    console.error('Failed to LISTEN for device changes', error);
+    retry(error);
+  }
+};
+listenForDeviceChanges();
+
+const getCachedDevice = async (deviceId) => {
+  const cached = deviceCache.get(deviceId);
+  deviceCache.delete(deviceId);
+  if (cached && cached.expires > Date.now()) {
+    deviceCache.set(deviceId, cached);
+    return cached.row;
+  }
+  const generation = deviceGeneration;
+  const result = await pool.query({
+    text: 'SELECT * FROM devices WHERE device_id = $1',
+    values: [deviceId],
+  });
+  const row = result.rows[0] || null;
+  if (generation === deviceGeneration) {
+    deviceCache.set(deviceId, { row, expires: Date.now() + DEVICE_CACHE_TTL_MS });
+    if (deviceCache.size > DEVICE_CACHE_MAX) {
+      deviceCache.delete(deviceCache.keys().next().value);
+    }
+  }
+  return row;
+};
+
 // Devices
 app.post('/api/devices', async (req, res) => {
   try {
@@ -89,6 +202,7 @@ app.post('/api/devices', async (req, res) => {
       values: [deviceId, name, type, location, protocol, metadata],
     };
     const result = await pool.query(query);
+    await notifyDevicesChanged();
     res.status(201).json(result.rows[0]);
   } catch (error) {
     console.error('Error creating device', error);
@@ -96,30 +210,137 @@ app.post('/api/devices', async (req, res) => {
   }
 });
 
+// Bulk provisioning: JSON array or NDJSON body, upserted in chunks of BULK_CHUNK rows.
+// For very large fleets use simulators/provision_devices.py, which COPYs straight into Postgres.
+const BULK_CHUNK = 5000;
+const BULK_BODY_LIMIT = '100mb';
+
+const BULK_UPSERT_SQL = `
+  INSERT INTO devices(device_id, name, type, location, building, floor, protocol, status, metadata)
+  SELECT device_id, name, type, location, building, floor,
+         COALESCE(protocol, 'mqtt'), COALESCE(status, 'active'), metadata
+  FROM jsonb_to_recordset($1::jsonb) AS d(
+    device_id VARCHAR, name VARCHAR, type VARCHAR, location VARCHAR, building VARCHAR,
+    floor INTEGER, protocol VARCHAR, status VARCHAR, metadata JSONB)
+  ON CONFLICT (device_id) DO UPDATE SET
+    name = EXCLUDED.name,
+    type = EXCLUDED.type,
+    location = EXCLUDED.location,
+    building = EXCLUDED.building,
+    floor = EXCLUDED.floor,
+    protocol = EXCLUDED.protocol,
+    status = EXCLUDED.status,
+    metadata = EXCLUDED.metadata,
+    updated_at = CURRENT_TIMESTAMP`;
+
+const normalizeBulkDevice = (d) => ({
+  device_id: d.deviceId || d.device_id,
+  name: d.name,
+  type: d.type,
+  location: d.location,
+  building: d.building,
+  floor: d.floor,
+  protocol: d.protocol,
+  status: d.status,
+  metadata: d.metadata,
+});
+
+const bulkBody = [
+  express.json({ limit: BULK_BODY_LIMIT }),
+  express.text({ type: 'application/x-ndjson', limit: BULK_BODY_LIMIT }),
+];
+
+app.post('/api/devices/bulk', bulkBody, async (req, res) => {
+  let devices;
+  try {
+    devices = typeof req.body === 'string'
+      ? req.body.split('\n').filter((line) => line.trim()).map((line) => JSON.parse(line))
+      : req.body;
+  } catch (error) {
+    return res.status(400).json({ error: 'Invalid NDJSON body' });
+  }
+  if (!Array.isArray(devices)) {
+    return res.status(400).json({ error: 'Expected an array of devices' });
+  }
+  if (devices.some((d) => d === null || typeof d !== 'object' || Array.isArray(d))) {
+    return res.status(400).json({ error: 'Every device must be a JSON object' });
+  }
+  const normalized = devices.map(normalizeBulkDevice);
+  if (normalized.some((d) => !d.device_id || !d.name || !d.type)) {
+    return res.status(400).json({ error: 'Every device needs deviceId, name and type' });
+  }
+  // One row per device_id (last one wins): ON CONFLICT DO UPDATE cannot touch a row twice
+  const rows = [...new Map(normalized.map((d) => [d.device_id, d])).values()];
+
+  let client;
+  try {
+    client = await pool.connect();
+    await client.query('BEGIN');
+    for (let i = 0; i < rows.length; i += BULK_CHUNK) {
+      await client.query(BULK_UPSERT_SQL, [JSON.stringify(rows.slice(i, i + BULK_CHUNK))]);
+    }
+    await client.query('NOTIFY devices_changed');
+    await client.query('COMMIT');
+    invalidateDevices();
+    res.status(200).json({ upserted: rows.length });
+  } catch (error) {
+    if (client) {
+      await client.query('ROLLBACK').catch(() => {});
+    }
+    console.error('Error bulk provisioning devices', error);
+    res.status(500).json({ error: 'Internal Server Error' });
+  } finally {
+    if (client) {
+      client.release();
+    }
+  }
+});
+
 app.get('/api/devices', async (req, res) => {
   try {
     const { status, type, location } = req.query;
-    let query = 'SELECT * FROM devices';
-    const values = [];
-    if (status || type || location) {
-      query += ' WHERE ';
-      const conditions = [];
-      if (status) {
-        conditions.push(`status = $${values.length + 1}`);
-        values.push(status);
+    const cacheKey = JSON.stringify([status, type, location]);
+    let cached = deviceListCache.get(cacheKey);
+
+    if (!cached || cached.expires <= Date.now()) {
+      const generation = deviceGeneration;
+      let query = 'SELECT * FROM devices';
+      const values = [];
+      if (status || type || location) {
+        query += ' WHERE ';
+        const conditions = [];
+        if (status) {
+          conditions.push(`status = $${values.length + 1}`);
+          values.push(status);
+        }
+        if (type) {
+          conditions.push(`type = $${values.length + 1}`);
+          values.push(type);
+        }
+        if (location) {
+          conditions.push(`location = $${values.length + 1}`);
+          values.push(location);
+        }
+        query += conditions.join(' AND ');
       }
-      if (type) {
-        conditions.push(`type = $${values.length + 1}`);
-        values.push(type);
+      const result = await pool.query(query, values);
+      const body = JSON.stringify(result.rows);
+      cached = {
+        body,
+        etag: `"${crypto.createHash('sha1').update(body).digest('hex')}"`,
+        expires: Date.now() + DEVICE_CACHE_TTL_MS,
+      };
+      if (generation === deviceGeneration) {
+        deviceListCache.set(cacheKey, cached);
       }
-      if (location) {
-        conditions.push(`location = $${values.length + 1}`);
-        values.push(location);
-      }
-      query += conditions.join(' AND ');
     }
-    const result = await pool.query(query, values);
-    res.json(result.rows);
+
+    // Pollers such as the simulator orchestrator send If-None-Match and get a 304
+    res.set('ETag', cached.etag);
+    if (req.headers['if-none-match'] === cached.etag) {
+      return res.status(304).end();
+    }
+    res.type('application/json').send(cached.body);
   } catch (error) {
     console.error('Error getting devices', error);
     res.status(500).json({ error: 'Internal Server Error' });
@@ -129,15 +350,11 @@ app.get('/api/devices', async (req, res) => {
 app.get('/api/devices/:deviceId', async (req, res) => {
   try {
     const { deviceId } = req.params;
-    const query = {
-      text: 'SELECT * FROM devices WHERE device_id = $1',
-      values: [deviceId],
-    };
-    const result = await pool.query(query);
-    if (result.rows.length === 0) {
+    const device = await getCachedDevice(deviceId);
+    if (!device) {
       return res.status(404).json({ error: 'Device not found' });
     }
-    res.json(result.rows[0]);
+    res.json(device);
   } catch (error) {
     console.error('Error getting device', error);
     res.status(500).json({ error: 'Internal Server Error' });
@@ -198,6 +415,7 @@ app.patch('/api/devices/:deviceId', async (req, res) => {
     if (result.rows.length === 0) {
       return res.status(404).json({ error: 'Device not found' });
     }
+    await notifyDevicesChanged();
     res.json(result.rows[0]);
   } catch (error) {
     console.error('Error updating device', error);
@@ -213,6 +431,7 @@ app.delete('/api/devices/:deviceId', async (req, res) => {
       values: [deviceId],
     };
     await pool.query(query);
+    await notifyDevicesChanged();
     res.status(204).send();
   } catch (error) {
     console.error('Error deleting device', error);
@@ -225,46 +444,105 @@ app.post('/api/telemetry', async (req, res) => {
   try {
     const { deviceId, metric, value, unit, timestamp } = req.body;
     const query = {
-      text: 'INSERT INTO telemetry(device_id, metric, value, unit, timestamp) VALUES($1, $2, $3, $4, $5) RETURNING *',
+      text: 'INSERT INTO telemetry(device_id, metric, value, unit, timestamp) VALUES($1, $2, $3, $4, $5) ON CONFLICT (device_id, metric, timestamp) DO NOTHING RETURNING *',
       values: [deviceId, metric, value, unit, timestamp],
     };
     const result = await pool.query(query);
-    res.status(201).json(result.rows[0]);
+    if (result.rows.length > 0) {
+      return res.status(201).json(result.rows[0]);
+    }
+    // Same reading already stored (e.g. a retried request): return the existing row
+    const existing = await pool.query(
+      'SELECT * FROM telemetry WHERE device_id = $1 AND metric = $2 AND timestamp = $3',
+      [deviceId, metric, timestamp]
+    );
+    res.status(200).json(existing.rows[0]);
   } catch (error) {
     console.error('Error creating telemetry', error);
     res.status(500).json({ error: 'Internal Server Error' });
   }
 });
 
+const TELEMETRY_MAX_LIMIT = 10000;
+const TELEMETRY_STREAM_PAGE = 1000;
+
+// Keyset cursor: base64url("<timestamp as text>|<id>") of the last row of a page.
+// The timestamp travels as text so microseconds survive (JS Date keeps only ms).
+const encodeCursor = (row) => Buffer.from(`${row.cursor_ts}|${row.id}`).toString('base64url');
+
+const decodeCursor = (cursor) => {
+  const [ts, id] = Buffer.from(cursor, 'base64url').toString().split('|');
+  if (!ts || !/^\d+$/.test(id || '')) {
+    throw new Error('Invalid cursor');
+  }
+  return { ts, id };
+};
+
+// Builds the telemetry range query. deviceId and metric accept comma-separated lists.
+const buildTelemetryQuery = ({ deviceIds, metrics, startDate, endDate, order, after }, limit) => {
+  const values = [deviceIds];
+  let text = 'SELECT *, timestamp::text AS cursor_ts FROM telemetry WHERE device_id = ANY($1)';
+  if (metrics.length > 0) {
+    values.push(metrics);
+    text += ` AND metric = ANY($${values.length})`;
+  }
+  if (startDate) {
+    values.push(startDate);
+    text += ` AND timestamp >= $${values.length}`;
+  }
+  if (endDate) {
+    values.push(endDate);
+    text += ` AND timestamp <= $${values.length}`;
+  }
+  const direction = order === 'asc' ? 'ASC' : 'DESC';
+  if (after) {
+    values.push(after.ts, after.id);
+    const op = direction === 'ASC' ? '>' : '<';
+    text += ` AND (timestamp, id) ${op} ($${values.length - 1}::timestamp, $${values.length}::bigint)`;
+  }
+  values.push(limit);
+  text += ` ORDER BY timestamp ${direction}, id ${direction} LIMIT $${values.length}`;
+  return { text, values };
+};
+
+const stripCursor = ({ cursor_ts, ...row }) => row;
+
+const splitList = (param) => (param ? String(param).split(',').map((s) => s.trim()).filter(Boolean) : []);
+
 app.get('/api/telemetry', async (req, res) => {
-  try {
-    const { deviceId, metric, startDate, endDate, limit = 100 } = req.query;
-    if (!deviceId) {
-      return res.status(400).json({ error: 'Missing required field: deviceId' });
-    }
-    let query = 'SELECT * FROM telemetry WHERE device_id = $1';
-    const values = [deviceId];
-    if (metric) {
-      query += ` AND metric = $${values.length + 1}`;
-      values.push(metric);
-    }
-    if (startDate) {
-      query += ` AND timestamp >= $${values.length + 1}`;
-      values.push(startDate);
-    }
-    if (endDate) {
-      query += ` AND timestamp <= $${values.length + 1}`;
-      values.push(endDate);
+  const { deviceId, metric, startDate, endDate, order, cursor, format } = req.query;
+  const deviceIds = splitList(deviceId);
+  if (deviceIds.length === 0) {
+    return res.status(400).json({ error: 'Missing required field: deviceId' });
+  }
+  const limit = Math.max(1, Math.min(parseInt(req.query.limit, 10) || 100, TELEMETRY_MAX_LIMIT));
+
+  let after = null;
+  if (cursor) {
+    try {
+      after = decodeCursor(cursor);
+    } catch (error) {
+      return res.status(400).json({ error: 'Invalid cursor' });
     }
-    query += ` ORDER BY timestamp DESC LIMIT $${values.length + 1}`;
-    values.push(limit);
+  }
+  const params = { deviceIds, metrics: splitList(metric), startDate, endDate, order, after };
 
-    const result = await pool.query(query, values);
+  if (format === 'ndjson') {
+    return streamTelemetry(req, res, params);
+  }
+  if (req.query.points) {
+    return downsampleTelemetry(req, res, params);
+  }
+
+  try {
+    const result = await pool.query(buildTelemetryQuery(params, limit));
+    const rows = result.rows;
     res.json({
       deviceId,
       metric,
-      data: result.rows,
-      count: result.rows.length
+      data: rows.map(stripCursor),
+      count: rows.length,
+      nextCursor: rows.length === limit ? encodeCursor(rows[rows.length - 1]) : null
     });
   } catch (error) {
     console.error('Error getting telemetry', error);
@@ -272,6 +550,174 @@ app.get('/api/telemetry', async (req, res) => {
   }
 });
 
+// Chart mode: ?points=N[&downsample=lttb|minmax] returns about N rows per
+// device/metric. The range is read in ascending keyset pages and fed row by row
+// into one streaming downsampler per series, so it never sits in memory whole.
+const TELEMETRY_MAX_POINTS = 5000;
+
+const downsampleTelemetry = async (req, res, params) => {
+  const points = Math.min(Math.max(parseInt(req.query.points, 10) || 0, 3), TELEMETRY_MAX_POINTS);
+  const algorithm = req.query.downsample || 'lttb';
+  const Downsampler = DOWNSAMPLERS[algorithm];
+  if (!Downsampler) {
+    return res.status(400).json({ error: `Unknown downsample algorithm: ${algorithm}` });
+  }
+
+  try {
+    // Per-series time bounds size the buckets before streaming starts
+    const bounds = await pool.query(
+      'SELECT device_id, metric, MIN(timestamp) AS t0, MAX(timestamp) AS t1 FROM telemetry ' +
+      'WHERE device_id = ANY($1) AND ($2::varchar[] IS NULL OR metric = ANY($2)) ' +
+      'AND ($3::timestamp IS NULL OR timestamp >= $3) AND ($4::timestamp IS NULL OR timestamp <= $4) ' +
+      'GROUP BY device_id, metric',
+      [params.deviceIds, params.metrics.length > 0 ? params.metrics : null, params.startDate || null, params.endDate || null]
+    );
+    const samplers = new Map();
+    for (const b of bounds.rows) {
+      samplers.set(`${b.device_id}/${b.metric}`, new Downsampler(b.t0, b.t1, points));
+    }
+
+    let rowsRead = 0;
+    let after = null;
+    for (;;) {
+      const result = await pool.query(buildTelemetryQuery({ ...params, order: 'asc', after }, TELEMETRY_STREAM_PAGE));
+      for (const row of result.rows) {
+        const sampler = samplers.get(`${row.device_id}/${row.metric}`);
+        if (sampler) sampler.push(stripCursor(row));
+      }
+      rowsRead += result.rows.length;
+      if (result.rows.length < TELEMETRY_STREAM_PAGE) break;
+      const last = result.rows[result.rows.length - 1];
+      after = { ts: last.cursor_ts, id: last.id };
+    }
+
+    const data = [];
+    for (const sampler of samplers.values()) {
+      data.push(...sampler.finish());
+    }
+    res.json({
+      deviceId: req.query.deviceId,
+      metric: req.query.metric,
+      data,
+      count: data.length,
+      downsample: { algorithm, points, rowsRead },
+    });
+  } catch (error) {
+    console.error('Error downsampling telemetry', error);
+    res.status(500).json({ error: 'Internal Server Error' });
+  }
+};
+
+// Streams the whole range as NDJSON, walking it page by page with the keyset
+// cursor so neither the server nor the client ever holds more than one page.
+const streamTelemetry = async (req, res, params) => {
+  let closed = false;
+  req.on('close', () => { closed = true; });
+  res.status(200).set('Content-Type', 'application/x-ndjson');
+
+  try {
+    let after = params.after;
+    while (!closed) {
+      const result = await pool.query(buildTelemetryQuery({ ...params, after }, TELEMETRY_STREAM_PAGE));
+      const rows = result.rows;
+      if (rows.length === 0) break;
+
+      const chunk = rows.map((row) => JSON.stringify(stripCursor(row))).join('\n') + '\n';
+      if (!res.write(chunk)) {
+        // Backpressure: wait for the client to drain before fetching the next page
+        // Whichever event fires first removes both listeners, so they never pile up
+        await new Promise((resolve) => {
+          const done = () => {
+            res.off('drain', done);
+            res.off('close', done);
+            resolve();
+          };
+          res.on('drain', done);
+          res.on('close', done);
+        });
+      }
+      if (rows.length < TELEMETRY_STREAM_PAGE) break;
+      const last = rows[rows.length - 1];
+      after = { ts: last.cursor_ts, id: last.id };
+    }
+    res.end();
+  } catch (error) {
+    console.error('Error streaming telemetry', error);
+    res.destroy(error);
+  }
+};
+
+// Live telemetry (Server-Sent Events)
+// Each client keeps only the latest reading per device/metric and gets them in
+// one event every 1/maxHz seconds, so a burst of MQTT messages never queues up
+// per viewer and no viewer ever touches the database.
+const LIVE_DEFAULT_HZ = 1;
+const LIVE_MAX_HZ = 10;
+const LIVE_HEARTBEAT_MS = 15000;
+const liveClients = new Set();
+
+const publishLive = (deviceId, metric, payload) => {
+  const key = `${deviceId}/${metric}`;
+  for (const client of liveClients) {
+    if (client.deviceIds && !client.deviceIds.has(deviceId)) continue;
+    if (client.metrics && !client.metrics.has(metric)) continue;
+    client.pending.set(key, {
+      deviceId,
+      metric,
+      value: payload.value,
+      unit: payload.unit,
+      timestamp: payload.timestamp,
+      metadata: payload.metadata,
+    });
+  }
+};
+
+const flushLiveClient = (client) => {
+  // While the socket is backed up, readings keep coalescing in pending
+  if (client.blocked || client.pending.size === 0) return;
+  const readings = [...client.pending.values()];
+  client.pending.clear();
+  if (!client.res.write(`event: telemetry\ndata: ${JSON.stringify(readings)}\n\n`)) {
+    client.blocked = true;
+    client.res.once('drain', () => { client.blocked = false; });
+  }
+};
+
+app.get('/api/stream/telemetry', (req, res) => {
+  const deviceIds = splitList(req.query.deviceId);
+  const metrics = splitList(req.query.metric);
+  const maxHz = Math.min(Math.max(parseFloat(req.query.maxHz) || LIVE_DEFAULT_HZ, 0.1), LIVE_MAX_HZ);
+
+  res.set({
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    Connection: 'keep-alive',
+    'X-Accel-Buffering': 'no', // Nginx must not buffer the stream
+  });
+  res.flushHeaders();
+  res.write('retry: 3000\n\n');
+
+  const client = {
+    res,
+    deviceIds: deviceIds.length > 0 ? new Set(deviceIds) : null,
+    metrics: metrics.length > 0 ? new Set(metrics) : null,
+    pending: new Map(),
+    blocked: false,
+  };
+  liveClients.add(client);
+
+  const flushTimer = setInterval(() => flushLiveClient(client), 1000 / maxHz);
+  const heartbeatTimer = setInterval(() => {
+    if (!client.blocked) res.write(': ping\n\n');
+  }, LIVE_HEARTBEAT_MS);
+
+  req.on('close', () => {
+    clearInterval(flushTimer);
+    clearInterval(heartbeatTimer);
+    liveClients.delete(client);
+  });
+});
+
 // Rules
 app.post('/api/rules', async (req, res) => {
   try {
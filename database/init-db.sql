@@ -38,7 +38,27 @@ CREATE TABLE telemetry (
 -- Índices críticos para consultas de series temporales
 CREATE INDEX idx_telemetry_device_metric ON telemetry(device_id, metric);
 CREATE INDEX idx_telemetry_timestamp ON telemetry(timestamp DESC);
-CREATE INDEX idx_telemetry_device_timestamp ON telemetry(device_id, timestamp DESC);
+-- Incluye id para la paginación por keyset sobre (timestamp, id)
+CREATE INDEX idx_telemetry_device_timestamp ON telemetry(device_id, timestamp DESC, id DESC);
+-- Una lectura por (device_id, metric, timestamp): hace idempotentes las reentregas QoS 1
+CREATE UNIQUE INDEX idx_telemetry_dedup ON telemetry(device_id, metric, timestamp);
+
+-- Tabla: telemetry_archive (tier frío)
+-- Un bloque comprimido por (device_id, metric, día); ver simulators/archive_telemetry.py
+CREATE TABLE telemetry_archive (
+  device_id VARCHAR(50) NOT NULL REFERENCES devices(device_id) ON DELETE CASCADE,
+  metric VARCHAR(50) NOT NULL,
+  day DATE NOT NULL,
+  unit VARCHAR(20),
+  start_ts TIMESTAMP NOT NULL,  -- primera y última lectura del bloque
+  end_ts TIMESTAMP NOT NULL,
+  row_count INTEGER NOT NULL,
+  data BYTEA NOT NULL,  -- delta-of-delta de timestamps + deltas de valor escalado, bit-packed
+  archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (device_id, metric, day)
+);
+-- El bloque ya está comprimido: sin compresión TOAST
+ALTER TABLE telemetry_archive ALTER COLUMN data SET STORAGE EXTERNAL;
 
 -- Tabla: rules
 CREATE TABLE rules (
@@ -0,0 +1,23 @@
+-- Migración para bases de datos creadas antes del índice único de telemetría.
+-- El backend y los consumidores de ingesta insertan con
+-- ON CONFLICT (device_id, metric, timestamp) DO NOTHING, que exige este índice.
+--
+-- Ejecutar ANTES de desplegar el backend nuevo, fuera de una transacción
+-- (CREATE INDEX CONCURRENTLY no puede ir dentro de BEGIN/COMMIT):
+--   psql "$DATABASE_URL" -f database/migrations/001_telemetry_dedup.sql
+--
+-- Si la creación del índice falla (p. ej. entró un duplicado mientras se
+-- construía), queda un índice INVALID: ejecutar
+--   DROP INDEX CONCURRENTLY idx_telemetry_dedup;
+-- y volver a lanzar este script.
+
+-- 1. Eliminar lecturas duplicadas, conservando la de menor id
+DELETE FROM telemetry t
+USING telemetry d
+WHERE t.device_id = d.device_id
+  AND t.metric = d.metric
+  AND t.timestamp = d.timestamp
+  AND t.id > d.id;
+
+-- 2. Crear el índice único sin bloquear las escrituras
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_telemetry_dedup ON telemetry(device_id, metric, timestamp);
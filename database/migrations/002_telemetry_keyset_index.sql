@@ -0,0 +1,21 @@
+-- Migración para bases de datos creadas antes de la paginación por keyset.
+-- GET /api/telemetry ordena por (timestamp, id); idx_telemetry_device_timestamp
+-- debe incluir id para servir ese orden desde el índice sin ordenar en memoria.
+--
+-- Ejecutar fuera de una transacción (CREATE/DROP INDEX CONCURRENTLY no pueden
+-- ir dentro de BEGIN/COMMIT):
+--   psql "$DATABASE_URL" -f database/migrations/002_telemetry_keyset_index.sql
+--
+-- El índice nuevo se construye con otro nombre antes de borrar el antiguo, así
+-- las consultas nunca se quedan sin índice. Si la creación falla, queda un
+-- índice INVALID: ejecutar
+--   DROP INDEX CONCURRENTLY idx_telemetry_device_timestamp_id;
+-- y volver a lanzar este script.
+
+-- 1. Crear el índice con id sin bloquear las escrituras
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_telemetry_device_timestamp_id
+  ON telemetry(device_id, timestamp DESC, id DESC);
+
+-- 2. Sustituir el índice antiguo
+DROP INDEX CONCURRENTLY IF EXISTS idx_telemetry_device_timestamp;
+ALTER INDEX idx_telemetry_device_timestamp_id RENAME TO idx_telemetry_device_timestamp;
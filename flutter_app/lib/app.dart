@@ -4,7 +4,7 @@ import 'package:campus_iot_app/config/routes.dart';
 import 'package:campus_iot_app/config/theme.dart';
 import 'package:campus_iot_app/providers/device_provider.dart';
 import 'package:campus_iot_app/providers/telemetry_provider.dart';
-import 'package:campus_iot_app/services/mqtt_service.dart';
+import 'package:campus_iot_app/services/live_telemetry_service.dart';
 
 class MyApp extends StatefulWidget {
   const MyApp({Key? key}) : super(key: key);
@@ -14,27 +14,13 @@ class MyApp extends StatefulWidget {
 }
 
 class _MyAppState extends State<MyApp> {
-  final MqttService _mqttService = MqttService();
-
-  @override
-  void initState() {
-    super.initState();
-    // Connect to MQTT broker on app start
-    _connectToMqtt();
-  }
-
-  Future<void> _connectToMqtt() async {
-    try {
-      await _mqttService.connect();
-      print('✅ MQTT connected successfully');
-    } catch (e) {
-      print('⚠️ MQTT connection failed: $e');
-    }
-  }
+  // Live values arrive from the backend push stream (SSE); the app no longer
+  // keeps its own broker connection subscribed to every campus topic.
+  final LiveTelemetryService _liveService = LiveTelemetryService();
 
   @override
   void dispose() {
-    _mqttService.disconnect();
+    _liveService.dispose();
     super.dispose();
   }
 
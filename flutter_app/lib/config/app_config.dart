@@ -20,6 +20,9 @@ class AppConfig {
   static const Duration deviceRefreshInterval = Duration(seconds: 30);
   static const Duration telemetryRefreshInterval = Duration(seconds: 60);
 
+  // Live push (SSE): max updates per second the backend sends to this client
+  static const double liveMaxHz = 1;
+
   // Pagination
   static const int defaultPageSize = 50;
   static const int telemetryDefaultLimit = 100;
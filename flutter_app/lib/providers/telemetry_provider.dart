@@ -1,12 +1,12 @@
 import 'package:flutter/foundation.dart';
 import 'package:campus_iot_app/models/telemetry.dart';
 import 'package:campus_iot_app/services/api_service.dart';
-import 'package:campus_iot_app/services/mqtt_service.dart';
+import 'package:campus_iot_app/services/live_telemetry_service.dart';
 import 'dart:async';
 
 class TelemetryProvider with ChangeNotifier {
   final ApiService _apiService = ApiService();
-  final MqttService _mqttService = MqttService();
+  final LiveTelemetryService _liveService = LiveTelemetryService();
   
   // Historical telemetry data
   final Map<String, List<Telemetry>> _telemetryData = {};
@@ -92,8 +92,8 @@ class TelemetryProvider with ChangeNotifier {
     // Cancel existing subscription if any
     _streamSubscriptions[deviceId]?.cancel();
     
-    // Subscribe to MQTT stream
-    final stream = _mqttService.subscribeTelemetry(deviceId);
+    // Subscribe to the backend push stream (SSE)
+    final stream = _liveService.subscribe(deviceId);
     
     _streamSubscriptions[deviceId] = stream.listen(
       (telemetry) {
@@ -121,7 +121,7 @@ class TelemetryProvider with ChangeNotifier {
         notifyListeners();
       },
       onError: (error) {
-        print('❌ Error in MQTT stream: $error');
+        print('❌ Error in live stream: $error');
         _error = error.toString();
         notifyListeners();
       },
@@ -134,6 +134,7 @@ class TelemetryProvider with ChangeNotifier {
   void unsubscribeFromRealTime(String deviceId) {
     _streamSubscriptions[deviceId]?.cancel();
     _streamSubscriptions.remove(deviceId);
+    _liveService.unsubscribe(deviceId);
     print('🔕 Unsubscribed from real-time telemetry for: $deviceId');
   }
   
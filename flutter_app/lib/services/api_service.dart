@@ -109,6 +109,7 @@ class ApiService {
     DateTime? startDate,
     DateTime? endDate,
     int limit = 100,
+    int? points, // Server-side downsampling (LTTB) for charts; ignores limit
   }) async {
     final queryParams = <String, String>{
       'deviceId': deviceId,
@@ -116,6 +117,7 @@ class ApiService {
       if (startDate != null) 'startDate': startDate.toIso8601String(),
       if (endDate != null) 'endDate': endDate.toIso8601String(),
       'limit': limit.toString(),
+      if (points != null) 'points': points.toString(),
     };
 
     final uri = Uri.parse('$baseUrl/telemetry').replace(
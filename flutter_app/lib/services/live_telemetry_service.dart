@@ -0,0 +1,123 @@
+import 'dart:async';
+import 'dart:convert';
+import 'package:http/http.dart' as http;
+import 'package:campus_iot_app/config/app_config.dart';
+import 'package:campus_iot_app/models/telemetry.dart';
+
+// Live telemetry pushed by the backend over Server-Sent Events
+// (GET /api/stream/telemetry). One HTTP connection per subscribed device,
+// reconnected automatically; no polling of the telemetry table.
+class LiveTelemetryService {
+  final Map<String, _LiveConnection> _connections = {};
+
+  // Singleton pattern
+  static final LiveTelemetryService _instance =
+      LiveTelemetryService._internal();
+  factory LiveTelemetryService() => _instance;
+  LiveTelemetryService._internal();
+
+  Stream<Telemetry> subscribe(String deviceId, {String? metric}) {
+    final connection = _connections.putIfAbsent(
+      deviceId,
+      () => _LiveConnection(deviceId: deviceId, metric: metric)..start(),
+    );
+    return connection.controller.stream;
+  }
+
+  void unsubscribe(String deviceId) {
+    _connections.remove(deviceId)?.close();
+  }
+
+  void dispose() {
+    for (final connection in _connections.values) {
+      connection.close();
+    }
+    _connections.clear();
+  }
+}
+
+class _LiveConnection {
+  final String deviceId;
+  final String? metric;
+  final StreamController<Telemetry> controller =
+      StreamController<Telemetry>.broadcast();
+
+  http.Client? _client;
+  bool _closed = false;
+  Duration _retryDelay = const Duration(seconds: 1);
+
+  _LiveConnection({required this.deviceId, this.metric});
+
+  Future<void> start() async {
+    while (!_closed) {
+      try {
+        await _listen();
+        _retryDelay = const Duration(seconds: 1);
+      } catch (e) {
+        if (_closed) return;
+        print('⚠️ Live stream for $deviceId interrupted: $e');
+      }
+      if (_closed) return;
+      await Future.delayed(_retryDelay);
+      // Exponential backoff up to 30 s
+      if (_retryDelay < const Duration(seconds: 30)) {
+        _retryDelay *= 2;
+      }
+    }
+  }
+
+  Future<void> _listen() async {
+    final uri = Uri.parse('${AppConfig.apiBaseUrl}/stream/telemetry').replace(
+      queryParameters: {
+        'deviceId': deviceId,
+        if (metric != null) 'metric': metric!,
+        'maxHz': AppConfig.liveMaxHz.toString(),
+      },
+    );
+    final request = http.Request('GET', uri)
+      ..headers['Accept'] = 'text/event-stream';
+
+    _client = http.Client();
+    final response = await _client!.send(request);
+    if (response.statusCode != 200) {
+      throw Exception('HTTP ${response.statusCode}');
+    }
+    print('📡 Live stream connected for: $deviceId');
+
+    String? event;
+    final data = StringBuffer();
+    await for (final line in response.stream
+        .transform(utf8.decoder)
+        .transform(const LineSplitter())) {
+      if (line.isEmpty) {
+        // Blank line terminates one SSE event
+        if (event == 'telemetry' && data.isNotEmpty) {
+          _emit(data.toString());
+        }
+        event = null;
+        data.clear();
+      } else if (line.startsWith('event:')) {
+        event = line.substring(6).trim();
+      } else if (line.startsWith('data:')) {
+        data.write(line.substring(5).trim());
+      }
+    }
+  }
+
+  void _emit(String data) {
+    try {
+      final List readings = json.decode(data);
+      for (final reading in readings) {
+        controller.add(Telemetry.fromJson(reading));
+      }
+    } catch (e) {
+      print('❌ Error parsing live telemetry: $e');
+    }
+  }
+
+  void close() {
+    _closed = true;
+    _client?.close();
+    controller.close();
+  }
+}
@@ -1,13 +1,14 @@
 import paho.mqtt.client as mqtt
 from paho.mqtt.client import CallbackAPIVersion
 import json
+import os
 import time
 import random
 from datetime import datetime
 
 # Configuration
-BROKER = "68.183.174.210"     # IP pública del VPS (o mqtt.uidehub.tech)
-PORT = 1883
+BROKER = os.environ.get("MQTT_BROKER", "68.183.174.210")     # IP pública del VPS (o mqtt.uidehub.tech)
+PORT = int(os.environ.get("MQTT_PORT", 1883))
 MQTT_USER = "mqtt_user"       # el usuario real creado en mosquitto_passwd
 MQTT_PASS = "mysecretpws"     # tu clave real
 DEVICE_ID = "lab-01-energy"
@@ -1,13 +1,14 @@
 import paho.mqtt.client as mqtt
 from paho.mqtt.client import CallbackAPIVersion
 import json
+import os
 import time
 import random
 from datetime import datetime
 
 # Configuration
-BROKER = "localhost"  # Use localhost for local development
-PORT = 1883
+BROKER = os.environ.get("MQTT_BROKER", "localhost")  # Use localhost for local development
+PORT = int(os.environ.get("MQTT_PORT", 1883))
 DEVICE_ID = "lab-01-light"
 TOPIC = f"campus/{DEVICE_ID}/illumination"
 
@@ -0,0 +1,141 @@
+import numpy as np
+
+HOURS = 24
+
+
+class SeriesIndex:
+    """Maps (device_id, metric) pairs to dense integer slots"""
+
+    def __init__(self):
+        self._slots = {}
+
+    def __len__(self):
+        return len(self._slots)
+
+    def lookup(self, device_id, metric):
+        key = (device_id, metric)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._slots)
+            self._slots[key] = slot
+        return slot
+
+
+class WelfordState:
+    """Running count/mean/M2 for many series, stored as flat arrays"""
+
+    def __init__(self, capacity):
+        self.count = np.zeros(capacity, dtype=np.float64)
+        self.mean = np.zeros(capacity, dtype=np.float64)
+        self.m2 = np.zeros(capacity, dtype=np.float64)
+
+    def grow(self, capacity):
+        for name in ("count", "mean", "m2"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def std(self, idx):
+        count = self.count[idx]
+        var = np.divide(self.m2[idx], count - 1, out=np.zeros_like(count), where=count > 1)
+        return np.sqrt(var)
+
+    def merge(self, idx, values):
+        """Merges a batch into the state (Chan et al. parallel Welford).
+        idx may contain repeated slots; values are grouped per slot first."""
+        slots, inverse, n_b = np.unique(idx, return_inverse=True, return_counts=True)
+        sum_b = np.bincount(inverse, weights=values)
+        mean_b = sum_b / n_b
+        dev = values - mean_b[inverse]
+        m2_b = np.bincount(inverse, weights=dev * dev)
+
+        n_a = self.count[slots]
+        n = n_a + n_b
+        delta = mean_b - self.mean[slots]
+        self.mean[slots] += delta * n_b / n
+        self.m2[slots] += m2_b + delta * delta * n_a * n_b / n
+        self.count[slots] = n
+
+
+class AnomalyDetector:
+    """Per-series z-score detector over a global Welford baseline, an EWMA and
+    an hour-of-day seasonal baseline. All state lives in numpy arrays indexed
+    by series slot, so one update costs O(1) per sample.
+
+    A sample is flagged only when it is far from both the long-run baseline and
+    the EWMA. Flagged samples are kept out of the baselines, except after
+    adapt_after consecutive flags: that run is taken as a level shift and folded
+    in, so the EWMA follows the new level within a few samples."""
+
+    def __init__(self, capacity=1024, z_threshold=4.0, ewma_alpha=0.1, min_samples=30, adapt_after=5):
+        self.index = SeriesIndex()
+        self.capacity = capacity
+        self.z_threshold = z_threshold
+        self.ewma_alpha = ewma_alpha
+        self.min_samples = min_samples
+        self.global_stats = WelfordState(capacity)
+        # Seasonal slot = series_slot * 24 + hour; the simulator hour bands are unions of these
+        self.seasonal_stats = WelfordState(capacity * HOURS)
+        self.ewma = np.zeros(capacity, dtype=np.float64)
+        self.adapt_after = adapt_after
+        self.streak = np.zeros(capacity, dtype=np.int64)  # consecutive flagged samples per series
+
+    def _ensure_capacity(self, needed):
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        self.global_stats.grow(capacity)
+        self.seasonal_stats.grow(capacity * HOURS)
+        for name in ("ewma", "streak"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.capacity] = old
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def slots_for(self, keys):
+        """keys: iterable of (device_id, metric) -> int array of series slots"""
+        slots = np.fromiter((self.index.lookup(d, m) for d, m in keys), dtype=np.int64)
+        self._ensure_capacity(len(self.index))
+        return slots
+
+    def update(self, slots, values, hours):
+        """Scores a micro-batch against the state before the batch, then folds it in.
+        Returns (flags, z_scores, baselines) aligned with the inputs."""
+        values = np.asarray(values, dtype=np.float64)
+        hours = np.asarray(hours, dtype=np.int64)
+        seasonal = slots * HOURS + hours
+
+        # Prefer the seasonal baseline once it has enough samples for this hour
+        use_seasonal = self.seasonal_stats.count[seasonal] >= self.min_samples
+        baseline = np.where(use_seasonal, self.seasonal_stats.mean[seasonal], self.global_stats.mean[slots])
+        std = np.where(use_seasonal, self.seasonal_stats.std(seasonal), self.global_stats.std(slots))
+        ready = self.global_stats.count[slots] >= self.min_samples
+
+        z = np.divide(values - baseline, std, out=np.zeros_like(values), where=std > 0)
+        ewma_z = np.divide(values - self.ewma[slots], std, out=np.zeros_like(values), where=std > 0)
+        flags = ready & (np.abs(z) > self.z_threshold) & (np.abs(ewma_z) > self.z_threshold)
+
+        # A series with any normal sample in the batch starts its run over
+        np.add.at(self.streak, slots[flags], 1)
+        self.streak[slots[~flags]] = 0
+
+        # Flagged points do not pollute the baselines, unless they form a level shift
+        keep = ~flags | (self.streak[slots] >= self.adapt_after)
+        if keep.any():
+            self.global_stats.merge(slots[keep], values[keep])
+            self.seasonal_stats.merge(seasonal[keep], values[keep])
+            self._update_ewma(slots[keep], values[keep])
+
+        return flags, z, baseline
+
+    def _update_ewma(self, slots, values):
+        # A batch of n samples with mean m is applied as one step of weight 1 - (1 - alpha)^n
+        uniq, inverse, n = np.unique(slots, return_inverse=True, return_counts=True)
+        batch_mean = np.bincount(inverse, weights=values) / n
+        first = self.global_stats.count[uniq] == n
+        weight = np.where(first, 1.0, 1.0 - (1.0 - self.ewma_alpha) ** n)
+        self.ewma[uniq] += weight * (batch_mean - self.ewma[uniq])
@@ -0,0 +1,173 @@
+# Compressed cold-tier blocks for one (device_id, metric, day) series.
+#
+# Timestamps (µs since epoch) are stored as delta-of-delta and values
+# (NUMERIC(10, 2) as integers scaled by 10**scale) as deltas, both zigzag
+# encoded and bit-packed at the smallest width that fits each frame. A block is
+#
+#   header | frame directory (FRAME_DTYPE per frame) | packed payload
+#
+# Every frame of FRAME_SIZE samples restarts from its own first timestamp,
+# delta and value, so a range read binary-searches the directory and only
+# unpacks the frames that overlap the range, each one with numpy.
+import struct
+import numpy as np
+
+FRAME_SIZE = 256
+VALUE_SCALE = 2  # telemetry.value is NUMERIC(10, 2)
+MAGIC = b"TAB"
+VERSION = 1
+
+_HEADER = struct.Struct("<3sBBII")  # magic, version, scale, count, n_frames
+FRAME_DTYPE = np.dtype([
+    ("t0", "<i8"),  # first timestamp
+    ("d0", "<i8"),  # first timestamp delta (0 for single-sample frames)
+    ("v0", "<i8"),  # first scaled value
+    ("n", "<u2"),
+    ("t_bits", "u1"),  # width of each packed delta-of-delta
+    ("v_bits", "u1"),  # width of each packed value delta
+    ("offset", "<u4"),  # byte offset of the frame in the payload
+])
+
+
+def _zigzag(x):
+    # Small negative and positive deltas both map to small unsigned ints
+    return ((x << 1) ^ (x >> 63)).view(np.uint64)
+
+
+def _unzigzag(u):
+    return (u >> np.uint64(1)).view(np.int64) ^ -(u & np.uint64(1)).view(np.int64)
+
+
+def _width(u):
+    return int(u.max()).bit_length() if len(u) else 0
+
+
+def _packed_size(count, bits):
+    return (count * bits + 7) // 8
+
+
+def _pack(u, bits):
+    if bits == 0 or not len(u):
+        return b""
+    shifts = np.arange(bits - 1, -1, -1, dtype=np.uint64)
+    matrix = ((u[:, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+    return np.packbits(matrix.ravel()).tobytes()
+
+
+def _unpack(buf, count, bits):
+    if bits == 0 or count == 0:
+        return np.zeros(count, dtype=np.uint64)
+    matrix = np.unpackbits(np.frombuffer(buf, dtype=np.uint8), count=count * bits).reshape(count, bits)
+    weights = np.uint64(1) << np.arange(bits - 1, -1, -1, dtype=np.uint64)
+    return matrix.astype(np.uint64) @ weights
+
+
+def encode_block(timestamps, values, scale=VALUE_SCALE):
+    """timestamps: sorted int64 µs, values: int64 scaled by 10**scale -> bytes"""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    values = np.asarray(values, dtype=np.int64)
+    frames = []
+    payload = bytearray()
+    for start in range(0, len(timestamps), FRAME_SIZE):
+        t = timestamps[start:start + FRAME_SIZE]
+        v = values[start:start + FRAME_SIZE]
+        deltas = np.diff(t)
+        dod = _zigzag(np.diff(deltas))
+        dv = _zigzag(np.diff(v))
+        t_bits, v_bits = _width(dod), _width(dv)
+        frames.append((t[0], deltas[0] if len(deltas) else 0, v[0], len(t), t_bits, v_bits, len(payload)))
+        payload += _pack(dod, t_bits)
+        payload += _pack(dv, v_bits)
+    directory = np.array(frames, dtype=FRAME_DTYPE)
+    header = _HEADER.pack(MAGIC, VERSION, scale, len(timestamps), len(frames))
+    return header + directory.tobytes() + bytes(payload)
+
+
+class ArchiveBlock:
+    """Read-only view over an encoded block (bytes or the memoryview psycopg2 returns for BYTEA)"""
+
+    def __init__(self, data):
+        magic, version, self.scale, self.count, n_frames = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a telemetry archive block (magic={magic!r}, version={version})")
+        self.frames = np.frombuffer(data, dtype=FRAME_DTYPE, count=n_frames, offset=_HEADER.size)
+        self._payload = memoryview(data)[_HEADER.size + self.frames.nbytes:]
+
+    def _decode_frame(self, i):
+        frame = self.frames[i]
+        n, t_bits, v_bits = int(frame["n"]), int(frame["t_bits"]), int(frame["v_bits"])
+        n_dod, n_dv = max(n - 2, 0), n - 1
+        offset = int(frame["offset"])
+        t_end = offset + _packed_size(n_dod, t_bits)
+        dod = _unzigzag(_unpack(self._payload[offset:t_end], n_dod, t_bits))
+        dv = _unzigzag(_unpack(self._payload[t_end:t_end + _packed_size(n_dv, v_bits)], n_dv, v_bits))
+
+        timestamps = np.empty(n, dtype=np.int64)
+        timestamps[0] = frame["t0"]
+        if n > 1:
+            deltas = np.empty(n_dv, dtype=np.int64)
+            deltas[0] = frame["d0"]
+            deltas[1:] = frame["d0"] + np.cumsum(dod)
+            timestamps[1:] = frame["t0"] + np.cumsum(deltas)
+        values = np.empty(n, dtype=np.int64)
+        values[0] = frame["v0"]
+        values[1:] = frame["v0"] + np.cumsum(dv)
+        return timestamps, values
+
+    def read_scaled(self, start=None, end=None):
+        """(timestamps µs, scaled int values) with start <= t < end; only overlapping frames are decoded"""
+        t0 = self.frames["t0"]
+        first = 0 if start is None else max(0, int(np.searchsorted(t0, start, side="right")) - 1)
+        last = len(t0) if end is None else int(np.searchsorted(t0, end, side="left"))
+        parts = [self._decode_frame(i) for i in range(first, last)]
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        timestamps = np.concatenate([p[0] for p in parts])
+        values = np.concatenate([p[1] for p in parts])
+        mask = np.ones(len(timestamps), dtype=bool)
+        if start is not None:
+            mask &= timestamps >= start
+        if end is not None:
+            mask &= timestamps < end
+        return timestamps[mask], values[mask]
+
+    def read(self, start=None, end=None):
+        """(timestamps µs, float64 values) with start <= t < end"""
+        timestamps, values = self.read_scaled(start, end)
+        return timestamps, values / 10 ** self.scale
+
+
+def to_micros(t):
+    """datetime / ISO string (naive, UTC like telemetry.timestamp) -> int µs since epoch"""
+    return int(np.datetime64(t, "us").astype(np.int64))
+
+
+def read_range(conn, device_id, metric, start, end):
+    """One series in [start, end) from telemetry_archive and the hot telemetry table,
+    merged in time order. Returns (datetime64[us] array, float64 array)."""
+    start_us, end_us = to_micros(start), to_micros(end)
+    timestamps, values = [], []
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT data FROM telemetry_archive "
+            "WHERE device_id = %s AND metric = %s AND start_ts < %s AND end_ts >= %s ORDER BY day",
+            (device_id, metric, end, start),
+        )
+        for (data,) in cur:
+            t, v = ArchiveBlock(data).read(start_us, end_us)
+            timestamps.append(t)
+            values.append(v)
+        cur.execute(
+            "SELECT (EXTRACT(EPOCH FROM timestamp) * 1000000)::bigint, value::float8 FROM telemetry "
+            "WHERE device_id = %s AND metric = %s AND timestamp >= %s AND timestamp < %s",
+            (device_id, metric, start, end),
+        )
+        hot = np.array(cur.fetchall(), dtype=np.float64).reshape(-1, 2)
+    timestamps.append(hot[:, 0].astype(np.int64))
+    values.append(hot[:, 1])
+
+    timestamps = np.concatenate(timestamps)
+    values = np.concatenate(values)
+    # A reading re-delivered after its day was archived exists in both tiers: keep one
+    timestamps, first = np.unique(timestamps, return_index=True)
+    return timestamps.astype("datetime64[us]"), values[first]
@@ -1,14 +1,18 @@
 import paho.mqtt.client as mqtt
 from paho.mqtt.client import CallbackAPIVersion
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
+from .topic_alias import TopicAliasTable, WireStats
+from .metrics import PublishMetrics
 import json
 import time
 import threading
 import random
-from datetime import datetime
+from datetime import datetime, timezone
 
 class BaseSimulator(threading.Thread):
-    def __init__(self, device_id, topic_suffix, interval=5, broker="localhost", port=1883):
-        super().__init__()
+    def __init__(self, device_id, topic_suffix, interval=5, broker="localhost", port=1883, anomaly_rate=0.0, mqtt_version=3, verbose=True, broker_pool=None, tls_context=None):
+        super().__init__(name=f"sim_{device_id}_{topic_suffix}")
         self.device_id = device_id
         self.interval = interval
         self.broker = broker
@@ -18,6 +22,17 @@ class BaseSimulator(threading.Thread):
         self.client = None
         self.connected = False  # Track connection status
         self.daemon = True  # Daemon thread stops when main program stops
+        self.anomaly_rate = anomaly_rate  # Fraction of samples replaced by labelled anomalies
+        self.mqtt_version = mqtt_version  # 3 (v3.1.1) or 5
+        self.topic_aliases = TopicAliasTable()
+        self.wire_stats = WireStats()
+        self.metrics = PublishMetrics()
+        self.verbose = verbose  # Log every publish
+        self.publish_timeout = 10  # seconds to wait for the PUBACK
+        self._wake = threading.Event()  # Interrupts the sleep between publishes
+        self.broker_pool = broker_pool  # Optional BrokerPool; overrides broker/port
+        self._pool_generation = None
+        self.tls_context = tls_context  # Shared SharedTlsContext; None for plaintext
 
     def run(self):
         self.running = True
@@ -25,43 +40,101 @@ class BaseSimulator(threading.Thread):
         print(f"🚀 [{self.device_id}] Simulator started. Publishing to {self.topic}")
         
         while self.running:
+            started = time.perf_counter()
             try:
+                if self.connected and self._endpoint_moved():
+                    print(f"🔀 [{self.device_id}] Rebalancing to {self.broker_pool.endpoint_for(self.topic)}")
+                    self.connected = False
                 if not self.connected:
                     print(f"⚠️ [{self.device_id}] Reconnecting...")
                     self._connect_mqtt()
                 
                 # Only publish if connected
                 if self.connected:
-                    payload = self._generate_payload()
-                    result = self.client.publish(self.topic, json.dumps(payload), qos=1)
-                    result.wait_for_publish()  # Wait for message to be sent
+                    payload = self._next_payload()
+                    data = json.dumps(payload)
+                    sent = time.perf_counter()
+                    result = self._publish(data)
+                    # Wait for the PUBACK, but notice a dropped connection without sitting out the timeout
+                    deadline = sent + self.publish_timeout
+                    while not result.is_published() and self.connected and time.perf_counter() < deadline:
+                        result.wait_for_publish(0.05)
+                    if not result.is_published():
+                        if not self.connected:
+                            raise ConnectionError("connection lost before PUBACK")
+                        raise TimeoutError(f"no PUBACK after {self.publish_timeout}s")
+                    latency = time.perf_counter() - sent
+                    self.metrics.record(latency)
+                    if self.broker_pool:
+                        self.broker_pool.record((self.broker, self.port), latency)
                     
                     # Log only occasionally or on first publish to avoid console spam
-                    print(f"📤 [{self.device_id}] Published data to {self.topic}") 
+                    if self.verbose:
+                        print(f"📤 [{self.device_id}] Published data to {self.topic}") 
                 
             except Exception as e:
                 print(f"❌ [{self.device_id}] Error: {e}")
+                self.metrics.error()
+                if self.broker_pool:
+                    self.broker_pool.error((self.broker, self.port))
                 self.connected = False
             
-            time.sleep(self.interval)
+            # Keep a steady rate: the publish round-trip counts towards the interval
+            self._wake.wait(max(0, self.interval - (time.perf_counter() - started)))
+            self._wake.clear()
 
         if self.client:
             self.client.loop_stop()
             self.client.disconnect()
-            print(f"🛑 [{self.device_id}] Stopped.")
+            print(f"🛑 [{self.device_id}] Stopped. {self.wire_stats.summary()}")
 
     def stop(self):
         self.running = False
+        self._wake.set()
         print(f"🛑 [{self.device_id}] Stopping...")
 
+    def set_interval(self, interval):
+        # Takes effect immediately instead of after the current sleep
+        self.interval = interval
+        self._wake.set()
+
+    def _publish(self, data):
+        v5 = self.mqtt_version == 5
+        properties = None
+        wire_topic, alias = self.topic, None
+        if v5:
+            wire_topic, alias = self.topic_aliases.resolve(self.topic)
+            if alias is not None:
+                properties = Properties(PacketTypes.PUBLISH)
+                properties.TopicAlias = alias
+        self.wire_stats.record(self.topic, wire_topic, alias, len(data.encode()), qos=1, v5=v5)
+        return self.client.publish(wire_topic, data, qos=1, properties=properties)
+
+    def _endpoint_moved(self):
+        if not self.broker_pool or self.broker_pool.generation == self._pool_generation:
+            return False
+        self._pool_generation = self.broker_pool.generation
+        return self.broker_pool.endpoint_for(self.topic) != (self.broker, self.port)
+
     def _connect_mqtt(self):
+        if self.client:
+            # Drop the previous connection and its network thread before replacing it
+            self.client.loop_stop()
+            self.client.disconnect()
+        if self.broker_pool:
+            self._pool_generation = self.broker_pool.generation
+            self.broker, self.port = self.broker_pool.endpoint_for(self.topic)
         try:
             self.connected = False
-            self.client = mqtt.Client(CallbackAPIVersion.VERSION2, client_id=f"sim_{self.device_id}")
+            protocol = mqtt.MQTTv5 if self.mqtt_version == 5 else mqtt.MQTTv311
+            self.client = mqtt.Client(CallbackAPIVersion.VERSION2, client_id=f"sim_{self.device_id}", protocol=protocol)
             
             # Set up callbacks
             def on_connect(client, userdata, flags, rc, properties):
                 if rc == 0:
+                    # Aliases are per connection: start over with the limit from this CONNACK
+                    alias_max = getattr(properties, "TopicAliasMaximum", 0) if self.mqtt_version == 5 else 0
+                    self.topic_aliases.reset(alias_max)
                     self.connected = True
                 else:
                     print(f"❌ [{self.device_id}] Connection failed with code {rc}")
@@ -71,6 +144,8 @@ class BaseSimulator(threading.Thread):
             
             self.client.on_connect = on_connect
             self.client.on_disconnect = on_disconnect
+            if self.tls_context:
+                self.client.tls_set_context(self.tls_context)
             
             self.client.connect(self.broker, self.port, 60)
             self.client.loop_start()
@@ -87,6 +162,30 @@ class BaseSimulator(threading.Thread):
             print(f"❌ [{self.device_id}] MQTT Connection Failed: {e}")
             self.connected = False
 
+        if self.broker_pool:
+            if self.connected:
+                self.broker_pool.report_success((self.broker, self.port))
+            else:
+                self.broker_pool.report_failure((self.broker, self.port), self.topic)
+
+
+    def _next_payload(self):
+        payload = self._generate_payload()
+        if self.anomaly_rate and random.random() < self.anomaly_rate:
+            self._inject_anomaly(payload)
+        return payload
+
+    def _inject_anomaly(self, payload):
+        # Push the value well outside its normal range and label it for benchmarking
+        value = payload.get("value", 0)
+        offset = max(abs(value), 1) * random.uniform(1.5, 3.0)
+        payload["value"] = round(value + random.choice((-1, 1)) * offset, 2)
+        payload.setdefault("metadata", {})["anomaly"] = True
+
+    def _timestamp(self):
+        # Millisecond resolution: below a 1 s interval, whole seconds would collide on the
+        # unique (device_id, metric, timestamp) index and later readings would be dropped
+        return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
 
     def _generate_payload(self):
         # Override this in child classes
@@ -0,0 +1,154 @@
+import bisect
+import hashlib
+import socket
+import threading
+import time
+from .metrics import PublishMetrics, percentile
+
+VIRTUAL_NODES = 100  # ring points per endpoint, evens out the key spread
+PROBE_INTERVAL = 5  # seconds between reachability checks of down endpoints
+FAILURE_THRESHOLD = 3  # different keys failing in a row before an endpoint counts as down
+
+
+def parse_endpoints(spec, default_port=1883):
+    """"host1:1883,host2:1884,host3" -> [("host1", 1883), ("host2", 1884), ("host3", 1883)]"""
+    endpoints = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.rpartition(":") if ":" in item else (item, "", "")
+        endpoints.append((host, int(port) if port else default_port))
+    return endpoints
+
+
+def _hash(key):
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+def _reachable(endpoint, timeout=2):
+    try:
+        socket.create_connection(endpoint, timeout=timeout).close()
+        return True
+    except OSError:
+        return False
+
+
+class BrokerPool:
+    """Consistent-hash ring of MQTT broker endpoints shared by all simulators.
+    A key (the simulator topic) maps to the first healthy endpoint clockwise on
+    the ring, so losing an endpoint only moves its own keys to the survivors,
+    and its keys move back once a probe sees it reachable again."""
+
+    def __init__(self, endpoints, virtual_nodes=VIRTUAL_NODES, failure_threshold=FAILURE_THRESHOLD):
+        if not endpoints:
+            raise ValueError("BrokerPool needs at least one endpoint")
+        self.endpoints = list(endpoints)
+        self._ring = sorted(
+            (_hash(f"{host}:{port}#{i}"), (host, port))
+            for host, port in self.endpoints
+            for i in range(virtual_nodes)
+        )
+        self._ring_keys = [h for h, _ in self._ring]
+        self._down = set()
+        self._suspects = {}  # endpoint -> keys whose connects failed since the last success
+        self._probing = set()
+        self.failure_threshold = failure_threshold
+        self._lock = threading.Lock()
+        self.generation = 0  # bumped on every health change; simulators compare it to rebalance
+        self.metrics = {endpoint: PublishMetrics() for endpoint in self.endpoints}
+        self.totals = {endpoint: {"published": 0, "errors": 0} for endpoint in self.endpoints}
+        self._prober = None
+
+    def endpoint_for(self, key):
+        with self._lock:
+            down = set(self._down)
+        # With everything down, fall back to the plain ring owner and keep retrying it
+        start = bisect.bisect(self._ring_keys, _hash(key)) % len(self._ring)
+        for offset in range(len(self._ring)):
+            endpoint = self._ring[(start + offset) % len(self._ring)][1]
+            if endpoint not in down:
+                return endpoint
+        return self._ring[start][1]
+
+    def report_failure(self, endpoint, key):
+        """A connect to endpoint failed for key. One timeout during a connect storm must not
+        move every key off a healthy broker, so the endpoint only goes down when a TCP probe
+        fails too, or when failure_threshold different keys fail with no success in between."""
+        with self._lock:
+            if endpoint in self._down or endpoint not in self.metrics:
+                return
+            suspects = self._suspects.setdefault(endpoint, set())
+            suspects.add(key)
+            confirmed = len(suspects) >= self.failure_threshold
+            probe = not confirmed and endpoint not in self._probing
+            if probe:
+                self._probing.add(endpoint)
+        if probe:
+            try:
+                confirmed = not _reachable(endpoint, timeout=1)
+            finally:
+                with self._lock:
+                    self._probing.discard(endpoint)
+        if confirmed:
+            self.mark_down(endpoint)
+
+    def report_success(self, endpoint):
+        with self._lock:
+            self._suspects.pop(endpoint, None)
+
+    def mark_down(self, endpoint):
+        with self._lock:
+            if endpoint in self._down or endpoint not in self.metrics:
+                return
+            self._down.add(endpoint)
+            self._suspects.pop(endpoint, None)
+            self.generation += 1
+        print(f"🔻 Broker {endpoint[0]}:{endpoint[1]} marked down, failing over")
+
+    def mark_up(self, endpoint):
+        with self._lock:
+            if endpoint not in self._down:
+                return
+            self._down.discard(endpoint)
+            self.generation += 1
+        print(f"🔺 Broker {endpoint[0]}:{endpoint[1]} is back, rebalancing")
+
+    def record(self, endpoint, latency):
+        metrics = self.metrics.get(endpoint)
+        if metrics:
+            metrics.record(latency)
+
+    def error(self, endpoint):
+        metrics = self.metrics.get(endpoint)
+        if metrics:
+            metrics.error()
+
+    def start_probing(self, interval=PROBE_INTERVAL):
+        """Background TCP probe that brings recovered endpoints back into the ring"""
+
+        def probe():
+            while True:
+                time.sleep(interval)
+                with self._lock:
+                    down = list(self._down)
+                for endpoint in down:
+                    if _reachable(endpoint):
+                        self.mark_up(endpoint)
+
+        self._prober = threading.Thread(target=probe, name="broker-pool-probe", daemon=True)
+        self._prober.start()
+
+    def report(self, elapsed):
+        """Prints per-endpoint throughput and PUBACK latency since the previous report"""
+        with self._lock:
+            down = set(self._down)
+        for endpoint in self.endpoints:
+            published, errors, latencies = self.metrics[endpoint].drain()
+            totals = self.totals[endpoint]
+            totals["published"] += published
+            totals["errors"] += errors
+            state = "DOWN" if endpoint in down else "up"
+            print(f"   {endpoint[0]}:{endpoint[1]} [{state}] {published / elapsed:.1f} msg/s "
+                  f"p50={percentile(latencies, 50) * 1000:.0f}ms p95={percentile(latencies, 95) * 1000:.0f}ms "
+                  f"errors={errors} total={totals['published']}")
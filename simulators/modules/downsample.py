@@ -0,0 +1,156 @@
+# Streaming downsamplers, same algorithms as backend/downsample.js. Rows must
+# arrive in ascending time order, so any iterable (e.g. TelemetryClient.stream())
+# can be reduced without loading it. min_max keeps two rows per bucket; lttb
+# keeps the output plus the convex hull of its two open buckets (see _Bucket).
+from datetime import datetime
+
+
+def _seconds(t):
+    if isinstance(t, datetime):
+        return t.timestamp()
+    if isinstance(t, str):
+        return datetime.fromisoformat(t.replace("Z", "+00:00")).timestamp()
+    return float(t)
+
+
+def _row_time(row):
+    return _seconds(row["timestamp"])
+
+
+def _row_value(row):
+    return float(row["value"])
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+class _Bucket:
+    """Running sums plus the convex hull of a bucket's (t, v) points. For a fixed
+    anchor and next-bucket average the LTTB triangle area is |linear in (t, v)|,
+    so its maximum always lies on a hull vertex and every other row can be
+    dropped. Noisy series keep a few dozen rows per bucket; only a long strictly
+    convex run (every point on the hull) keeps them all."""
+
+    __slots__ = ("index", "n", "sum_t", "sum_v", "lower", "upper")
+
+    def __init__(self, index):
+        self.index = index
+        self.n = 0
+        self.sum_t = 0.0
+        self.sum_v = 0.0
+        self.lower = []
+        self.upper = []
+
+    def add(self, t, v, seq, row):
+        self.n += 1
+        self.sum_t += t
+        self.sum_v += v
+        point = (t, v, seq, row)
+        # Andrew's monotone chain; rows arrive sorted by time. For equal times the
+        # lower hull keeps only the lowest value and the upper hull the highest.
+        lower, upper = self.lower, self.upper
+        if not (lower and lower[-1][0] == t and lower[-1][1] <= v):
+            if lower and lower[-1][0] == t:
+                lower.pop()
+            while len(lower) >= 2 and _cross(lower[-2], lower[-1], point) <= 0:
+                lower.pop()
+            lower.append(point)
+        if not (upper and upper[-1][0] == t and upper[-1][1] >= v):
+            if upper and upper[-1][0] == t:
+                upper.pop()
+            while len(upper) >= 2 and _cross(upper[-2], upper[-1], point) >= 0:
+                upper.pop()
+            upper.append(point)
+
+    def average(self):
+        return self.sum_t / self.n, self.sum_v / self.n
+
+    def candidates(self):
+        """Hull vertices in arrival order, so ties resolve to the earliest row"""
+        return sorted({p[2]: p for p in self.lower + self.upper}.values(), key=lambda p: p[2])
+
+
+def lttb(rows, start, end, points, time_key=_row_time, value_key=_row_value):
+    """Largest-Triangle-Three-Buckets over time buckets. Returns the kept rows."""
+    start = _seconds(start)
+    span = max(1e-9, _seconds(end) - start)
+    n_buckets = max(1, points - 2)
+    selected = []
+    open_buckets = []  # at most the current and next bucket
+    anchor = None  # hull point (t, v, seq, row) of the last kept row
+    pending = None
+    seq = 0
+
+    def bucket_of(t):
+        return min(n_buckets - 1, max(0, int((t - start) / span * n_buckets)))
+
+    def select(bucket, next_t, next_v):
+        nonlocal anchor
+        at, av = anchor[0], anchor[1]
+        best = max(
+            bucket.candidates(),
+            key=lambda p: abs((at - next_t) * (p[1] - av) - (at - p[0]) * (next_v - av)),
+        )
+        selected.append(best[3])
+        anchor = best
+
+    def add(row):
+        nonlocal seq
+        # Times relative to start keep the hull cross products well conditioned
+        t, v = time_key(row) - start, value_key(row)
+        index = bucket_of(t + start)
+        if not open_buckets or open_buckets[-1].index != index:
+            open_buckets.append(_Bucket(index))
+        open_buckets[-1].add(t, v, seq, row)
+        seq += 1
+        if len(open_buckets) == 3:
+            select(open_buckets.pop(0), *open_buckets[0].average())
+
+    for row in rows:
+        if anchor is None:
+            anchor = (time_key(row) - start, value_key(row), None, row)
+            selected.append(row)
+            continue
+        # The newest row is held back so the very last row is always kept as is
+        if pending is not None:
+            add(pending)
+        pending = row
+
+    while open_buckets:
+        if len(open_buckets) > 1:
+            next_t, next_v = open_buckets[1].average()
+        else:
+            next_t, next_v = time_key(pending) - start, value_key(pending)
+        select(open_buckets.pop(0), next_t, next_v)
+    if pending is not None:
+        selected.append(pending)
+    return selected
+
+
+def min_max(rows, start, end, points, time_key=_row_time, value_key=_row_value):
+    """Keeps the min and max row of each of points/2 time buckets, in time order"""
+    start = _seconds(start)
+    span = max(1e-9, _seconds(end) - start)
+    n_buckets = max(1, points // 2)
+    slots = {}
+
+    for row in rows:
+        index = min(n_buckets - 1, max(0, int((time_key(row) - start) / span * n_buckets)))
+        slot = slots.get(index)
+        if slot is None:
+            slots[index] = [row, row]
+            continue
+        if value_key(row) < value_key(slot[0]):
+            slot[0] = row
+        if value_key(row) > value_key(slot[1]):
+            slot[1] = row
+
+    result = []
+    for index in sorted(slots):
+        lo, hi = slots[index]
+        if lo is hi:
+            result.append(lo)
+        else:
+            result.extend(sorted((lo, hi), key=time_key))
+    return result
@@ -1,11 +1,10 @@
 from .base_simulator import BaseSimulator
 import random
-import time
 from datetime import datetime
 
 class EnergySimulator(BaseSimulator):
-    def __init__(self, device_id, interval=5):
-        super().__init__(device_id, "power", interval)
+    def __init__(self, device_id, interval=5, **kwargs):
+        super().__init__(device_id, "power", interval, **kwargs)
 
     def _generate_payload(self):
         hour = datetime.now().hour
@@ -25,7 +24,7 @@ class EnergySimulator(BaseSimulator):
         return {
             "value": val,
             "unit": "kW",
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "timestamp": self._timestamp(),
             "metadata": {
                 "voltage": round(random.uniform(220, 230), 1),
                 "frequency": round(random.uniform(59.8, 60.2), 1)
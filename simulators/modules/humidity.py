@@ -1,11 +1,10 @@
 from .base_simulator import BaseSimulator
 import random
-import time
 from datetime import datetime
 
 class HumiditySimulator(BaseSimulator):
-    def __init__(self, device_id, interval=5):
-        super().__init__(device_id, "humidity", interval)
+    def __init__(self, device_id, interval=5, **kwargs):
+        super().__init__(device_id, "humidity", interval, **kwargs)
 
     def _generate_payload(self):
         hour = datetime.now().hour
@@ -25,7 +24,7 @@ class HumiditySimulator(BaseSimulator):
         return {
             "value": val,
             "unit": "%",
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "timestamp": self._timestamp(),
             "metadata": {
                 "battery": random.randint(70, 100)
             }
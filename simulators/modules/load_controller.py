@@ -0,0 +1,138 @@
+import json
+import os
+import time
+from .metrics import percentile
+
+# SLO thresholds a step must meet to count as sustainable
+SLO_PUBACK_P95 = 0.5  # seconds
+SLO_COMMIT_LAG_P95 = 5.0  # seconds, broker -> row in telemetry
+SLO_ERROR_RATE = 0.01
+SLO_MIN_DELIVERED = 0.9  # achieved / target rate, and committed / achieved with a lag probe
+
+
+class CommitLagProbe:
+    """Measures how long published readings take to land in telemetry.
+    Optional: without a database (e.g. against mqtt_sink.py) lag is not checked."""
+
+    def __init__(self, database_url, device_ids):
+        import psycopg2
+        self.conn = psycopg2.connect(database_url)
+        self.conn.autocommit = True
+        self.device_ids = list(device_ids)
+
+    def measure(self, since):
+        # Payload timestamps are UTC with millisecond resolution
+        with self.conn.cursor() as cur:
+            cur.execute(
+                "SELECT COUNT(*), percentile_cont(0.95) WITHIN GROUP "
+                "(ORDER BY EXTRACT(EPOCH FROM created_at - timestamp)) "
+                "FROM telemetry WHERE device_id = ANY(%s) AND created_at >= to_timestamp(%s) AT TIME ZONE 'UTC'",
+                (self.device_ids, since),
+            )
+            rows, lag = cur.fetchone()
+        return rows, float(lag or 0.0)
+
+
+class LoadController:
+    """AIMD search for the highest aggregate publish rate that meets the SLOs.
+    The rate grows additively while a step is healthy and is cut
+    multiplicatively when it is not; every cut also halves the additive step,
+    so the search converges on the ceiling."""
+
+    def __init__(self, simulators, start_rate=10.0, increase=10.0, decrease=0.5,
+                 step_seconds=15, min_increase=1.0, max_steps=60, lag_probe=None):
+        self.simulators = list(simulators)
+        self.rate = start_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.step_seconds = step_seconds
+        self.min_increase = min_increase
+        self.max_steps = max_steps
+        self.lag_probe = lag_probe
+        self.steps = []
+
+    def _apply_rate(self, rate):
+        interval = len(self.simulators) / rate
+        for sim in self.simulators:
+            sim.set_interval(interval)
+
+    def _run_step(self):
+        for sim in self.simulators:
+            sim.metrics.drain()
+        started = time.time()
+        time.sleep(self.step_seconds)
+        elapsed = time.time() - started
+
+        published, errors, latencies = 0, 0, []
+        for sim in self.simulators:
+            p, e, lat = sim.metrics.drain()
+            published += p
+            errors += e
+            latencies.extend(lat)
+
+        step = {
+            "target_rate": round(self.rate, 2),
+            "achieved_rate": round(published / elapsed, 2),
+            "puback_p50": round(percentile(latencies, 50), 4),
+            "puback_p95": round(percentile(latencies, 95), 4),
+            "error_rate": round(errors / max(1, published + errors), 4),
+            "commit_lag_p95": None,
+        }
+        if self.lag_probe:
+            committed, lag = self.lag_probe.measure(started)
+            step["committed_rate"] = round(committed / elapsed, 2)
+            step["commit_lag_p95"] = round(lag, 2)
+
+        violations = []
+        if step["puback_p95"] > SLO_PUBACK_P95:
+            violations.append("puback_latency")
+        if step["error_rate"] > SLO_ERROR_RATE:
+            violations.append("publish_errors")
+        if step["commit_lag_p95"] is not None and step["commit_lag_p95"] > SLO_COMMIT_LAG_P95:
+            violations.append("commit_lag")
+        if step["achieved_rate"] < SLO_MIN_DELIVERED * self.rate:
+            violations.append("publisher_saturated")
+        # Acked but never stored (e.g. dropped as duplicates) does not count as sustained
+        if "committed_rate" in step and step["committed_rate"] < SLO_MIN_DELIVERED * step["achieved_rate"]:
+            violations.append("rows_not_committed")
+        step["violations"] = violations
+        return step
+
+    def run(self):
+        print(f"🎛️  AIMD load controller: {len(self.simulators)} simulators, {self.step_seconds}s per step")
+        best = None
+        for _ in range(self.max_steps):
+            self._apply_rate(self.rate)
+            step = self._run_step()
+            self.steps.append(step)
+            status = "✅" if not step["violations"] else f"⚠️ {','.join(step['violations'])}"
+            print(f"   target={step['target_rate']:.1f}/s achieved={step['achieved_rate']:.1f}/s "
+                  f"p95={step['puback_p95'] * 1000:.0f}ms lag={step['commit_lag_p95']} errors={step['error_rate']:.2%} {status}")
+
+            if not step["violations"]:
+                if best is None or step["achieved_rate"] > best["achieved_rate"]:
+                    best = step
+                self.rate += self.increase
+            else:
+                self.rate = max(self.min_increase, self.rate * self.decrease)
+                self.increase /= 2
+                if self.increase < self.min_increase:
+                    break
+        return best
+
+    def write_report(self, best, path="load_report.json"):
+        report = {
+            "simulators": len(self.simulators),
+            "max_sustainable_rate": best["achieved_rate"] if best else 0.0,
+            "slo": {
+                "puback_p95": SLO_PUBACK_P95,
+                "commit_lag_p95": SLO_COMMIT_LAG_P95,
+                "error_rate": SLO_ERROR_RATE,
+                "min_delivered": SLO_MIN_DELIVERED,
+            },
+            "steps": self.steps,
+        }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📈 Max sustainable rate: {report['max_sustainable_rate']:.1f} msg/s (report: {os.path.abspath(path)})")
+        return report
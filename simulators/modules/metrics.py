@@ -0,0 +1,47 @@
+import random
+import threading
+
+MAX_LATENCIES = 1000  # per drain; undrained metrics (no load controller) stay bounded
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class PublishMetrics:
+    """Thread-safe publish counters and PUBACK latencies, drained by whoever is watching.
+    Latencies are a uniform reservoir sample of at most MAX_LATENCIES per drain."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.published = 0
+        self.errors = 0
+        self._latencies = []
+
+    def record(self, latency):
+        with self._lock:
+            self.published += 1
+            if len(self._latencies) < MAX_LATENCIES:
+                self._latencies.append(latency)
+                return
+            # Reservoir sampling keeps the percentiles unbiased without keeping every sample
+            slot = random.randrange(self.published)
+            if slot < MAX_LATENCIES:
+                self._latencies[slot] = latency
+
+    def error(self):
+        with self._lock:
+            self.errors += 1
+
+    def drain(self):
+        """Returns (published, errors, latencies) since the previous drain and resets them"""
+        with self._lock:
+            snapshot = (self.published, self.errors, self._latencies)
+            self.published = 0
+            self.errors = 0
+            self._latencies = []
+        return snapshot
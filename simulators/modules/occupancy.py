@@ -1,11 +1,10 @@
 from .base_simulator import BaseSimulator
 import random
-import time
 from datetime import datetime
 
 class OccupancySimulator(BaseSimulator):
-    def __init__(self, device_id, interval=10):
-        super().__init__(device_id, "occupancy", interval)
+    def __init__(self, device_id, interval=10, **kwargs):
+        super().__init__(device_id, "occupancy", interval, **kwargs)
 
     def _generate_payload(self):
         hour = datetime.now().hour
@@ -23,5 +22,5 @@ class OccupancySimulator(BaseSimulator):
         return {
             "value": count,
             "unit": "persons",
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            "timestamp": self._timestamp()
         }
@@ -0,0 +1,196 @@
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+OUTPUT_DIR = "profiles"
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+DEFAULT_DURATION = 10  # seconds
+MAX_DURATION = 300  # seconds; a capture blocks every other one until it ends
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler for every thread in the process.
+    A background thread snapshots sys._current_frames() at a fixed interval,
+    so the profiled code runs unmodified and the process never restarts."""
+
+    def __init__(self, output_dir=OUTPUT_DIR, interval=SAMPLE_INTERVAL):
+        self.output_dir = output_dir
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._running = False
+
+    def trigger(self, duration=DEFAULT_DURATION):
+        """Starts a capture in the background. Returns False if one is already running."""
+        with self._lock:
+            if self._running:
+                return False
+            self._running = True
+        threading.Thread(target=self._capture, args=(duration,), name="sampling-profiler", daemon=True).start()
+        return True
+
+    def _capture(self, duration):
+        try:
+            print(f"🔬 Profiling all threads for {duration}s...")
+            stacks, samples, idle, elapsed = self._sample(duration)
+            paths = self._write(stacks, samples, idle, elapsed)
+            print(f"🔬 Profile written: {', '.join(paths)}")
+        finally:
+            with self._lock:
+                self._running = False
+
+    def _sample(self, duration):
+        me = threading.get_ident()
+        stacks = Counter()  # (thread group, code objects root -> leaf) -> samples
+        names = {}
+        idle_codes = {}  # code -> parked or not, decided once per code object
+        samples = idle = 0
+        started = time.perf_counter()
+        deadline = started + duration
+        next_round = started
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                # Threads parked in a wait/select are counted but not walked, so
+                # sleeping simulators neither slow the sampler nor swamp the totals
+                leaf = frame.f_code
+                parked = idle_codes.get(leaf)
+                if parked is None:
+                    parked = idle_codes[leaf] = self._is_idle(leaf)
+                if parked:
+                    idle += 1
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                name = names.get(ident)
+                if name is None:
+                    names.update((t.ident, t.name) for t in threading.enumerate())
+                    name = names.get(ident, str(ident))
+                stacks[(name, tuple(reversed(stack)))] += 1
+            samples += 1
+            # Fixed rate from each round's start, not a fixed pause after the work
+            next_round += self.interval
+            delay = next_round - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_round = time.perf_counter()
+        return self._fold(stacks), samples, idle, time.perf_counter() - started
+
+    @staticmethod
+    def _is_idle(code):
+        filename = os.path.basename(code.co_filename)
+        qualname = getattr(code, "co_qualname", code.co_name)
+        if filename == "threading.py" and code.co_name in ("wait", "_wait_for_tstate_lock"):
+            return True
+        if filename == "selectors.py" and code.co_name == "select":
+            return True
+        # paho's network thread blocks in select.select() directly inside Client._loop
+        return "paho" in code.co_filename and qualname == "Client._loop"
+
+    def _fold(self, stacks):
+        """Turns code-object stacks into "group;func (file:line);..." strings, one label per code object"""
+        labels = {}
+        folded = Counter()
+        for (name, codes), count in stacks.items():
+            frames = [self._thread_group(name)]
+            for code in codes:
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                frames.append(label)
+            folded[";".join(frames)] += count
+        return folded
+
+    @staticmethod
+    def _thread_group(name):
+        # Fold per-sensor thread names into one root so the flamegraph aggregates them
+        if name.startswith("sim_"):
+            return "simulator-threads"
+        if name.startswith("paho-mqtt-client"):
+            return "paho-network-loop"
+        return name
+
+    def _write(self, stacks, samples, idle, elapsed):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        folded_path = os.path.join(self.output_dir, f"profile-{stamp}.folded")
+        totals_path = os.path.join(self.output_dir, f"profile-{stamp}.txt")
+
+        # Collapsed stacks: feed to flamegraph.pl or open in speedscope
+        with open(folded_path, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        own = Counter()
+        inclusive = Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")[1:]
+            if frames:
+                own[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+
+        total = sum(stacks.values()) or 1
+        with open(totals_path, "w") as f:
+            f.write(f"# {samples} sampling rounds in {elapsed:.1f}s ({samples / max(elapsed, 1e-9):.0f}/s, "
+                    f"target {1 / self.interval:.0f}/s), {total} busy thread samples, "
+                    f"{idle} idle (parked in wait/select, not shown)\n")
+            f.write(f"{'self%':>7} {'total%':>7}  function\n")
+            for frame, _ in inclusive.most_common():
+                f.write(f"{100 * own[frame] / total:7.2f} {100 * inclusive[frame] / total:7.2f}  {frame}\n")
+        return [folded_path, totals_path]
+
+
+def install_signal_trigger(profiler, signum=getattr(signal, "SIGUSR1", None), duration=DEFAULT_DURATION):
+    """kill -USR1 <pid> starts a capture (not available on Windows)"""
+    if signum is None:
+        return False
+    signal.signal(signum, lambda *_: profiler.trigger(duration))
+    return True
+
+
+def start_http_trigger(profiler, port, host="127.0.0.1"):
+    """GET http://127.0.0.1:<port>/profile?seconds=N starts a capture"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != "/profile":
+                self.send_error(404)
+                return
+            try:
+                seconds = float(parse_qs(url.query).get("seconds", [DEFAULT_DURATION])[0])
+            except ValueError:
+                seconds = None
+            if seconds is None or not seconds > 0:
+                self._reply(400, "seconds must be a positive number")
+                return
+            seconds = min(seconds, MAX_DURATION)
+            if profiler.trigger(seconds):
+                self._reply(202, f"profiling for {seconds}s, output in {profiler.output_dir}/")
+            else:
+                self._reply(409, "profile already running")
+
+        def _reply(self, status, message):
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain")
+            self.end_headers()
+            self.wfile.write(f"{message}\n".encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="profiler-http", daemon=True).start()
+    return server
@@ -0,0 +1,75 @@
+import requests
+import json
+
+API_URL = "http://localhost:8080/api"
+
+
+class TelemetryClient:
+    """Thin client for GET /api/telemetry. A single requests.Session keeps the
+    HTTP connection alive across pages."""
+
+    def __init__(self, base_url=API_URL, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _params(self, device_ids, metrics, start_date, end_date, order):
+        if isinstance(device_ids, str):
+            device_ids = [device_ids]
+        if isinstance(metrics, str):
+            metrics = [metrics]
+        params = {"deviceId": ",".join(device_ids), "order": order}
+        if metrics:
+            params["metric"] = ",".join(metrics)
+        if start_date:
+            params["startDate"] = start_date
+        if end_date:
+            params["endDate"] = end_date
+        return params
+
+    def iter_pages(self, device_ids, metrics=None, start_date=None, end_date=None, order="asc", page_size=1000):
+        """Yields one list of rows per page, following nextCursor lazily"""
+        params = self._params(device_ids, metrics, start_date, end_date, order)
+        params["limit"] = page_size
+        while True:
+            response = self.session.get(f"{self.base_url}/telemetry", params=params, timeout=self.timeout)
+            response.raise_for_status()
+            body = response.json()
+            if body["data"]:
+                yield body["data"]
+            cursor = body.get("nextCursor")
+            if not cursor:
+                return
+            params["cursor"] = cursor
+
+    def iter_rows(self, device_ids, metrics=None, start_date=None, end_date=None, order="asc", page_size=1000):
+        for page in self.iter_pages(device_ids, metrics, start_date, end_date, order, page_size):
+            yield from page
+
+    def stream(self, device_ids, metrics=None, start_date=None, end_date=None, order="asc"):
+        """Yields rows from the NDJSON endpoint as they arrive over a single response"""
+        params = self._params(device_ids, metrics, start_date, end_date, order)
+        params["format"] = "ndjson"
+        with self.session.get(f"{self.base_url}/telemetry", params=params, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def downsampled(self, device_ids, metrics=None, start_date=None, end_date=None, points=500, algorithm="lttb"):
+        """Server-side downsampling: about `points` rows per device/metric (lttb or minmax)"""
+        params = self._params(device_ids, metrics, start_date, end_date, "asc")
+        params["points"] = points
+        params["downsample"] = algorithm
+        response = self.session.get(f"{self.base_url}/telemetry", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["data"]
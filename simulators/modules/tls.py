@@ -0,0 +1,115 @@
+import ssl
+import threading
+import time
+from .metrics import percentile
+
+MAX_CONCURRENT_HANDSHAKES = 32  # caps broker CPU during fleet startup / reconnect storms
+
+
+class TlsStats:
+    """Thread-safe handshake counters and timings, split into full and resumed handshakes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.failures = 0
+        self._full = []
+        self._resumed = []
+
+    @property
+    def handshakes(self):
+        return len(self._full) + len(self._resumed)
+
+    def record(self, elapsed, resumed):
+        with self._lock:
+            (self._resumed if resumed else self._full).append(elapsed)
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def summary(self):
+        with self._lock:
+            full, resumed, failures = list(self._full), list(self._resumed), self.failures
+        total = len(full) + len(resumed)
+        reused = len(resumed) / total if total else 0.0
+        return (f"{total} TLS handshakes, {reused:.0%} resumed, {failures} failed | "
+                f"full p50={percentile(full, 50) * 1000:.1f}ms p95={percentile(full, 95) * 1000:.1f}ms | "
+                f"resumed p50={percentile(resumed, 50) * 1000:.1f}ms p95={percentile(resumed, 95) * 1000:.1f}ms")
+
+
+class _ResumingSSLSocket(ssl.SSLSocket):
+    """Offers the cached session for its endpoint, times the handshake and
+    stores the session once the server has sent its ticket"""
+
+    _endpoint = None
+    _session_saved = False
+
+    def do_handshake(self, block=False):
+        context = self.context
+        with context.handshake_gate:
+            started = time.perf_counter()
+            try:
+                super().do_handshake(block)
+            except (OSError, ssl.SSLError):
+                context.stats.failure()
+                raise
+        context.stats.record(time.perf_counter() - started, self.session_reused)
+
+    def recv(self, *args, **kwargs):
+        data = super().recv(*args, **kwargs)
+        # TLS 1.3 tickets arrive after the handshake, so the first read (CONNACK) is
+        # the earliest point where the session can actually be resumed
+        if not self._session_saved and data:
+            self._session_saved = True
+            self.context.save_session(self._endpoint, self.session)
+        return data
+
+
+class SharedTlsContext(ssl.SSLContext):
+    """One client SSLContext for every simulator (pass it to Client.tls_set_context).
+    Certificates are loaded once, sessions are cached per broker endpoint and
+    resumed by later connections and reconnects, and concurrent handshakes are
+    capped so a whole fleet connecting at once does not stall the broker."""
+
+    sslsocket_class = _ResumingSSLSocket
+
+    def __init__(self, protocol=ssl.PROTOCOL_TLS_CLIENT, max_concurrent_handshakes=MAX_CONCURRENT_HANDSHAKES):
+        self.stats = TlsStats()
+        self.handshake_gate = threading.BoundedSemaphore(max_concurrent_handshakes)
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+
+    def wrap_socket(self, sock, server_side=False, do_handshake_on_connect=True, suppress_ragged_eofs=True,
+                    server_hostname=None, session=None):
+        endpoint = (server_hostname, sock.getpeername()[1])
+        if session is None:
+            with self._sessions_lock:
+                session = self._sessions.get(endpoint)
+        # A session the broker no longer accepts just falls back to a full handshake
+        ssl_sock = super().wrap_socket(sock, server_side, do_handshake_on_connect, suppress_ragged_eofs,
+                                       server_hostname, session)
+        ssl_sock._endpoint = endpoint
+        return ssl_sock
+
+    def save_session(self, endpoint, session):
+        if session is not None:
+            with self._sessions_lock:
+                self._sessions[endpoint] = session
+
+
+def create_tls_context(ca_file=None, certfile=None, keyfile=None, insecure=False,
+                       max_concurrent_handshakes=MAX_CONCURRENT_HANDSHAKES):
+    """Client context for brokers on 8883. ca_file verifies a self-signed broker
+    certificate; insecure skips verification altogether (local testing only)."""
+    context = SharedTlsContext(ssl.PROTOCOL_TLS_CLIENT, max_concurrent_handshakes=max_concurrent_handshakes)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    if insecure:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif ca_file:
+        context.load_verify_locations(ca_file)
+    else:
+        context.load_default_certs()
+    if certfile:
+        context.load_cert_chain(certfile, keyfile)
+    return context
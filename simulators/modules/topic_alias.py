@@ -0,0 +1,63 @@
+def _varint_len(n):
+    length = 1
+    while n > 127:
+        n >>= 7
+        length += 1
+    return length
+
+
+def publish_packet_size(topic_len, payload_len, qos=1, v5=False, alias=False):
+    """Size in bytes of an MQTT PUBLISH packet on the wire"""
+    remaining = 2 + topic_len + payload_len
+    if qos > 0:
+        remaining += 2  # packet identifier
+    if v5:
+        props_len = 3 if alias else 0  # Topic Alias: 1 byte id + 2 byte value
+        remaining += _varint_len(props_len) + props_len
+    return 1 + _varint_len(remaining) + remaining
+
+
+class TopicAliasTable:
+    """Client-side MQTT v5 topic alias map. Aliases only live for one
+    connection, so reset() must be called with the broker's TopicAliasMaximum
+    from every CONNACK."""
+
+    def __init__(self, maximum=0):
+        self.reset(maximum)
+
+    def reset(self, maximum):
+        self.maximum = maximum or 0
+        self.aliases = {}
+
+    def resolve(self, topic):
+        """Returns (wire_topic, alias). wire_topic is "" once the alias is known to the broker."""
+        alias = self.aliases.get(topic)
+        if alias is not None:
+            return "", alias
+        if len(self.aliases) < self.maximum:
+            alias = len(self.aliases) + 1
+            self.aliases[topic] = alias
+            return topic, alias
+        return topic, None
+
+
+class WireStats:
+    """Counts PUBLISH bytes actually sent vs. bytes the same messages would take with full topics"""
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes_sent = 0
+        self.bytes_full = 0
+
+    def record(self, topic, wire_topic, alias, payload_len, qos=1, v5=False):
+        self.messages += 1
+        self.bytes_sent += publish_packet_size(len(wire_topic.encode()), payload_len, qos, v5, alias is not None)
+        self.bytes_full += publish_packet_size(len(topic.encode()), payload_len, qos, v5, False)
+
+    def summary(self):
+        if not self.messages:
+            return "no messages"
+        sent = self.bytes_sent / self.messages
+        full = self.bytes_full / self.messages
+        saved = 100 * (1 - self.bytes_sent / self.bytes_full)
+        return f"{self.messages} msgs, {sent:.1f} B/msg on the wire vs {full:.1f} B/msg with full topics ({saved:.1f}% saved)"
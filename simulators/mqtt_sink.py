@@ -0,0 +1,163 @@
+import asyncio
+import argparse
+import random
+import ssl
+import time
+
+# Configuration
+HOST = "127.0.0.1"
+PORT = 1883
+REPORT_INTERVAL = 5  # seconds
+
+# MQTT control packet types (high nibble of the first byte)
+CONNECT, PUBLISH, PUBREL, SUBSCRIBE, PINGREQ, DISCONNECT = 1, 3, 6, 8, 12, 14
+
+# Topic Alias Maximum advertised to v5 clients in CONNACK
+TOPIC_ALIAS_MAXIMUM = 10
+
+
+class SinkStats:
+    def __init__(self):
+        self.connections = 0
+        self.messages = 0
+        self.bytes = 0
+        self.dropped = 0
+        self.started = time.time()
+        self._last = (self.started, 0, 0)
+
+    def report(self):
+        now = time.time()
+        last_time, last_msgs, last_bytes = self._last
+        elapsed = now - last_time
+        msg_rate = (self.messages - last_msgs) / elapsed
+        byte_rate = (self.bytes - last_bytes) / elapsed
+        self._last = (now, self.messages, self.bytes)
+        print(f"📊 clients={self.connections} msgs={self.messages} ({msg_rate:,.0f}/s) "
+              f"bytes={self.bytes} ({byte_rate / 1024:,.1f} KiB/s) dropped={self.dropped}")
+
+
+class SinkProtocol(asyncio.Protocol):
+    """Accepts just enough MQTT 3.1.1/5 to keep publishers happy: CONNECT,
+    PUBLISH (QoS 0/1/2), SUBSCRIBE, PINGREQ and DISCONNECT. Payloads are
+    counted and discarded."""
+
+    def __init__(self, stats, latency, loss):
+        self.stats = stats
+        self.latency = latency
+        self.loss = loss
+        self.buffer = bytearray()
+        self.transport = None
+        self.v5 = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.stats.connections += 1
+
+    def connection_lost(self, exc):
+        self.stats.connections -= 1
+
+    def data_received(self, data):
+        self.buffer.extend(data)
+        while True:
+            packet = self._next_packet()
+            if packet is None:
+                return
+            self._handle(*packet)
+
+    def _next_packet(self):
+        # Fixed header: 1 type/flags byte + 1-4 byte variable length integer
+        buf = self.buffer
+        multiplier, remaining, pos = 1, 0, 1
+        while True:
+            if pos >= len(buf):
+                return None
+            byte = buf[pos]
+            remaining += (byte & 0x7F) * multiplier
+            multiplier *= 128
+            pos += 1
+            if not byte & 0x80:
+                break
+        if len(buf) < pos + remaining:
+            return None
+        header = buf[0]
+        body = bytes(buf[pos:pos + remaining])
+        size = pos + remaining
+        del buf[:size]
+        return header >> 4, header & 0x0F, body, size
+
+    def _handle(self, packet_type, flags, body, size):
+        if packet_type == PUBLISH:
+            self.stats.messages += 1
+            self.stats.bytes += size
+            qos = (flags >> 1) & 0x03
+            if qos == 0:
+                return
+            topic_len = int.from_bytes(body[0:2], "big")
+            packet_id = body[2 + topic_len:4 + topic_len]
+            if self.loss and random.random() < self.loss:
+                self.stats.dropped += 1
+                return
+            # PUBACK for QoS 1, PUBREC for QoS 2
+            self._send(bytes([0x40 if qos == 1 else 0x50, 0x02]) + packet_id, delayed=True)
+        elif packet_type == PUBREL:
+            self._send(bytes([0x70, 0x02]) + body[0:2], delayed=True)
+        elif packet_type == CONNECT:
+            name_len = int.from_bytes(body[0:2], "big")
+            self.v5 = body[2 + name_len] == 5
+            if self.v5:
+                props = bytes([0x22]) + TOPIC_ALIAS_MAXIMUM.to_bytes(2, "big")
+                self._send(bytes([0x20, 3 + len(props), 0x00, 0x00, len(props)]) + props)
+            else:
+                self._send(bytes([0x20, 0x02, 0x00, 0x00]))
+        elif packet_type == SUBSCRIBE:
+            # Grant QoS 0 to every filter; the sink never delivers anything anyway
+            packet_id = body[0:2]
+            self._send(bytes([0x90, 0x03]) + packet_id + b"\x00" if not self.v5
+                       else bytes([0x90, 0x04]) + packet_id + b"\x00\x00")
+        elif packet_type == PINGREQ:
+            self._send(bytes([0xD0, 0x00]))
+        elif packet_type == DISCONNECT:
+            self.transport.close()
+
+    def _send(self, data, delayed=False):
+        if delayed and self.latency:
+            asyncio.get_running_loop().call_later(self.latency, self._write, data)
+        else:
+            self._write(data)
+
+    def _write(self, data):
+        if not self.transport.is_closing():
+            self.transport.write(data)
+
+
+async def serve(host, port, latency, loss, ssl_context=None):
+    stats = SinkStats()
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(lambda: SinkProtocol(stats, latency, loss), host, port, ssl=ssl_context)
+    scheme = "TLS" if ssl_context else "TCP"
+    print(f"🕳️  MQTT sink listening on {host}:{port} over {scheme} (ack latency {latency * 1000:.0f} ms, loss {loss:.1%})")
+    async with server:
+        while True:
+            await asyncio.sleep(REPORT_INTERVAL)
+            stats.report()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local MQTT stand-in that acks and counts publishes without storing them")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Artificial delay before each PUBACK")
+    parser.add_argument("--loss", type=float, default=0.0, help="Fraction of QoS>0 publishes left unacknowledged")
+    parser.add_argument("--tls-cert", default=None, help="Serve TLS with this certificate (PEM), e.g. on port 8883")
+    parser.add_argument("--tls-key", default=None, help="Private key for --tls-cert")
+    args = parser.parse_args()
+
+    ssl_context = None
+    if args.tls_cert:
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(args.tls_cert, args.tls_key)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.latency_ms / 1000, args.loss, ssl_context))
+    except KeyboardInterrupt:
+        print("\n🛑 Sink stopped")
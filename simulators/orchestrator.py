@@ -1,4 +1,6 @@
 import requests
+import argparse
+import os
 import time
 import threading
 from modules.temperature import TemperatureSimulator
@@ -6,9 +8,15 @@ from modules.occupancy import OccupancySimulator
 from modules.light import LightSimulator
 from modules.humidity import HumiditySimulator
 from modules.energy import EnergySimulator
+from modules.topic_alias import WireStats
+from modules.profiler import SamplingProfiler, install_signal_trigger, start_http_trigger
+from modules.load_controller import LoadController, CommitLagProbe
+from modules.broker_pool import BrokerPool, parse_endpoints
+from modules.tls import create_tls_context
 
 API_URL = "http://localhost:8080/api/devices"
 POLL_INTERVAL = 10  # seconds
+START_STAGGER = 0.2  # seconds between simulator starts against a single plaintext broker
 
 # Map device types to Simulator classes
 SIMULATOR_MAP = {
@@ -22,15 +30,25 @@ SIMULATOR_MAP = {
 }
 
 class Orchestrator:
-    def __init__(self):
+    def __init__(self, sim_options=None):
         self.active_simulators = {} # unique_key -> simulator_instance
+        self.sim_options = sim_options or {} # extra kwargs passed to every simulator
+        self.session = requests.Session()
+        self._devices = []
+        self._devices_etag = None
 
     def fetch_devices(self):
         try:
-            response = requests.get(API_URL, timeout=5)
+            headers = {"If-None-Match": self._devices_etag} if self._devices_etag else {}
+            response = self.session.get(API_URL, headers=headers, timeout=5)
+            if response.status_code == 304:
+                # Registry unchanged since the last poll
+                return self._devices
             if response.status_code == 200:
                 data = response.json()
-                return data.get('devices', []) if isinstance(data, dict) else data
+                self._devices = data.get('devices', []) if isinstance(data, dict) else data
+                self._devices_etag = response.headers.get("ETag")
+                return self._devices
             else:
                 print(f"⚠️ API returned {response.status_code}")
                 return []
@@ -86,11 +104,13 @@ class Orchestrator:
                     # BaseSimulator handles the topic suffix based on type usually, 
                     # but our subclasses hardcode it in __init__ call to super.
                     # e.g. TemperatureSimulator passes "temperature".
-                    sim = sim_class(device_id) 
+                    sim = sim_class(device_id, **self.sim_options)
                     sim.start()
                     self.active_simulators[sim_key] = sim
                     # Small delay to avoid overwhelming MQTT broker with simultaneous connections
-                    time.sleep(0.2)
+                    delay = self._start_delay()
+                    if delay:
+                        time.sleep(delay)
 
         # Stop simulators that are no longer needed
         # (Device deleted, status changed, or sensor type removed from metadata)
@@ -100,6 +120,17 @@ class Orchestrator:
                 self.active_simulators[sim_key].stop()
                 del self.active_simulators[sim_key]
 
+    def _start_delay(self):
+        # With TLS the shared context's handshake semaphore (--max-handshakes) is the
+        # throttle, so the whole fleet is started at once; a broker pool splits the
+        # connections over its endpoints, so each one sees the usual stagger
+        if self.sim_options.get("tls_context"):
+            return 0
+        pool = self.sim_options.get("broker_pool")
+        if pool:
+            return START_STAGGER / len(pool.endpoints)
+        return START_STAGGER
+
     def run(self):
         print("🎹 Simulator Orchestrator Started (Multi-Sensor Supported)")
         print(f"📡 Monitoring API: {API_URL}")
@@ -107,14 +138,108 @@ class Orchestrator:
         
         try:
             while True:
+                started = time.time()
                 self.update_simulators()
                 time.sleep(POLL_INTERVAL)
+                pool = self.sim_options.get("broker_pool")
+                if pool:
+                    print("📡 Broker endpoints:")
+                    pool.report(time.time() - started)
+                tls_context = self.sim_options.get("tls_context")
+                if tls_context:
+                    print(f"🔒 {tls_context.stats.summary()}")
         except KeyboardInterrupt:
             print("\n🛑 Orchestrator stopping...")
             for sim in self.active_simulators.values():
                 sim.stop()
             print("✅ All simulators stopped.")
+            self.print_wire_summary()
+            if self.sim_options.get("tls_context"):
+                print(f"🔒 {self.sim_options['tls_context'].stats.summary()}")
+
+    def run_controller(self, database_url=None, **controller_options):
+        """Starts every listed sensor once, then lets the AIMD controller drive their rate"""
+        print("🎛️ Simulator Orchestrator Started (load controller mode)")
+        self.sim_options["verbose"] = False
+        self.update_simulators()
+        sims = list(self.active_simulators.values())
+        if not sims:
+            print("❌ No active MQTT sensors to drive")
+            return
+
+        lag_probe = None
+        if database_url:
+            lag_probe = CommitLagProbe(database_url, {sim.device_id for sim in sims})
+        controller = LoadController(sims, lag_probe=lag_probe, **controller_options)
+        try:
+            best = controller.run()
+            controller.write_report(best)
+        except KeyboardInterrupt:
+            print("\n🛑 Controller interrupted")
+        finally:
+            for sim in sims:
+                sim.stop()
+
+    def print_wire_summary(self):
+        total = WireStats()
+        for sim in self.active_simulators.values():
+            total.messages += sim.wire_stats.messages
+            total.bytes_sent += sim.wire_stats.bytes_sent
+            total.bytes_full += sim.wire_stats.bytes_full
+        print(f"📊 MQTT wire usage: {total.summary()}")
 
 if __name__ == "__main__":
-    orchestrator = Orchestrator()
-    orchestrator.run()
+    parser = argparse.ArgumentParser(description="Start one simulator per active MQTT sensor listed by the API")
+    parser.add_argument("--broker", default="localhost", help="MQTT broker host (e.g. a local mqtt_sink.py)")
+    parser.add_argument("--port", type=int, default=None, help="Default 1883, or 8883 with --tls")
+    parser.add_argument("--anomaly-rate", type=float, default=0.0,
+                        help="Fraction of samples replaced by labelled anomalies (metadata.anomaly = true)")
+    parser.add_argument("--profile-port", type=int, default=None,
+                        help="Serve GET http://127.0.0.1:<port>/profile?seconds=N to capture a flamegraph")
+    parser.add_argument("--controller", action="store_true",
+                        help="Search for the max sustainable publish rate (AIMD) and write load_report.json")
+    parser.add_argument("--start-rate", type=float, default=10.0, help="Controller: initial aggregate msg/s")
+    parser.add_argument("--step-seconds", type=float, default=15.0, help="Controller: duration of each step")
+    parser.add_argument("--database-url", default=None,
+                        help="Controller: also check broker -> telemetry commit lag in this database")
+    parser.add_argument("--mqtt-version", type=int, choices=(3, 5), default=3,
+                        help="MQTT protocol version; 5 enables topic aliases")
+    parser.add_argument("--brokers", default=None,
+                        help="Comma-separated host:port list; sensors are spread over them by consistent hashing "
+                             "(overrides --broker/--port)")
+    parser.add_argument("--tls", action="store_true", help="Connect over TLS (shared context, session resumption)")
+    parser.add_argument("--ca-file", default=None, help="TLS: CA/self-signed certificate that signed the broker's")
+    parser.add_argument("--insecure", action="store_true", help="TLS: skip certificate verification (local only)")
+    parser.add_argument("--max-handshakes", type=int, default=32,
+                        help="TLS: concurrent handshakes allowed during startup/reconnect storms")
+    args = parser.parse_args()
+    port = args.port or (8883 if args.tls else 1883)
+
+    orchestrator = Orchestrator(sim_options={
+        "broker": args.broker,
+        "port": port,
+        "anomaly_rate": args.anomaly_rate,
+        "mqtt_version": args.mqtt_version,
+    })
+    if args.brokers:
+        broker_pool = BrokerPool(parse_endpoints(args.brokers, default_port=port))
+        broker_pool.start_probing()
+        orchestrator.sim_options["broker_pool"] = broker_pool
+        print(f"📡 Broker pool: {', '.join(f'{h}:{p}' for h, p in broker_pool.endpoints)}")
+    if args.tls:
+        orchestrator.sim_options["tls_context"] = create_tls_context(
+            args.ca_file, insecure=args.insecure, max_concurrent_handshakes=args.max_handshakes)
+        print(f"🔒 TLS enabled{' (verification disabled)' if args.insecure else ''}")
+
+    # Sampling profiler, triggered at runtime with `kill -USR1 <pid>` or the local HTTP endpoint
+    profiler = SamplingProfiler()
+    if install_signal_trigger(profiler):
+        print(f"🔬 Send SIGUSR1 to pid {os.getpid()} to capture a profile")
+    if args.profile_port:
+        start_http_trigger(profiler, args.profile_port)
+        print(f"🔬 Profiling endpoint: http://127.0.0.1:{args.profile_port}/profile?seconds=10")
+
+    if args.controller:
+        orchestrator.run_controller(args.database_url, start_rate=args.start_rate, step_seconds=args.step_seconds)
+    else:
+        orchestrator.run()
@@ -1,11 +1,12 @@
 import paho.mqtt.client as mqtt
 from paho.mqtt.client import CallbackAPIVersion
 import json
+import os
 import time
 
 # Configuration
-BROKER = "localhost"
-PORT = 1883
+BROKER = os.environ.get("MQTT_BROKER", "localhost")
+PORT = int(os.environ.get("MQTT_PORT", 1883))
 TEST_TOPIC = "test/connection"
 
 def on_connect(client, userdata, flags, rc, properties):